@@ -4,33 +4,69 @@ Loads API credentials from .env file
 """
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from dotenv import load_dotenv
 from logger import get_logger
 
-logger = get_logger()
-
 # Load .env file
 env_path = os.path.join(os.path.dirname(__file__), '.env')
 load_dotenv(env_path)
 
-# Get configuration
-API_KEY = os.getenv('BINANCE_API_KEY', '')
-API_SECRET = os.getenv('BINANCE_API_SECRET', '')
-BASE_URL = os.getenv('BINANCE_BASE_URL', 'https://fapi.binance.com')
+# Snapshot the environment once; all settings are resolved from this copy
+_env = dict(os.environ)
 
-# Validate configuration
-def validate_config():
-    """Validate that API credentials are configured"""
-    if not API_KEY or not API_SECRET:
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Immutable bot configuration resolved once at import"""
+    api_key: str
+    api_secret: str
+    base_url: str
+
+    @property
+    def has_credentials(self) -> bool:
+        """Whether usable API credentials are configured (validated on first access)"""
+        return _validate(self)
+
+
+@lru_cache(maxsize=4)
+def _validate(cfg: Config) -> bool:
+    """Validate that API credentials are configured (result cached per config)"""
+    logger = get_logger()
+
+    # Length check covers the missing case too (len('') < 20) in one condition
+    if len(cfg.api_key) >= 20 and len(cfg.api_secret) >= 20:
+        logger.info("API credentials loaded successfully")
+        return True
+
+    if not cfg.api_key or not cfg.api_secret:
         logger.warning("API credentials not configured. Using test mode only.")
-        return False
-    
-    if len(API_KEY) < 20 or len(API_SECRET) < 20:
+    else:
         logger.error("API credentials appear invalid (too short)")
-        return False
-    
-    logger.info("API credentials loaded successfully")
-    return True
+    return False
+
+
+config = Config(
+    api_key=_env.get('BINANCE_API_KEY', ''),
+    api_secret=_env.get('BINANCE_API_SECRET', ''),
+    base_url=_env.get('BINANCE_BASE_URL', 'https://fapi.binance.com')
+)
+
+# Module-level aliases kept for existing importers
+API_KEY = config.api_key
+API_SECRET = config.api_secret
+BASE_URL = config.base_url
+
+
+def validate_config():
+    """Validate that API credentials are configured"""
+    return config.has_credentials
+
 
-# Check configuration on import
-HAS_API_CREDENTIALS = validate_config()
+def __getattr__(name):
+    # HAS_API_CREDENTIALS is resolved on first access so importing this
+    # module has no logging or validation side effects
+    if name == 'HAS_API_CREDENTIALS':
+        return config.has_credentials
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
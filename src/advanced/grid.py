@@ -3,18 +3,101 @@ Grid Order Strategy for Binance Futures Trading Bot
 Automated buy-low/sell-high within a price range
 """
 
+import logging
+from collections import deque
+from enum import IntEnum
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from time import time_ns
+import numpy as np
 from validation import OrderValidator, ValidationError
 from logger import get_logger
 from limit_orders import LimitOrder
+from api_client import BATCH_CREATE_MAX
 
 logger = get_logger()
 
+GRID_SPACINGS = ('arithmetic', 'geometric')
+
+# Maximum number of grid orders submitted to the exchange concurrently
+GRID_ORDER_WORKERS = 10
+
+
+class LevelSide(IntEnum):
+    """Order side of a grid level, stored as a u1 code"""
+    BUY = 0
+    SELL = 1
+
+
+class LevelStatus(IntEnum):
+    """Placement status of a grid level, stored as a u1 code"""
+    PENDING = 0
+    PLACED = 1
+    FAILED = 2
+
+
+# Grid levels are stored as one packed record array per strategy,
+# with side and status held as LevelSide / LevelStatus codes.
+GRID_LEVEL_DTYPE = np.dtype([
+    ('level', 'i4'),
+    ('price', 'f8'),
+    ('quantity', 'f8'),
+    ('side', 'u1'),
+    ('status', 'u1'),
+    ('order_id', 'i8'),
+])
+_NO_ORDER_ID = -1
+
+# Code -> name lookup tables used when levels leave the strategy
+_SIDE_NAMES = tuple(side.name for side in LevelSide)
+_STATUS_NAMES = tuple(status.name for status in LevelStatus)
+
+
+def _grid_prices(lower: float, upper: float, num_grids: int, spacing: str) -> np.ndarray:
+    """Compute grid level prices with equal steps or equal ratios"""
+    if spacing == 'geometric':
+        return np.geomspace(lower, upper, num_grids)
+    return np.linspace(lower, upper, num_grids)
+
+
+def _spacing_params(lower: float, upper: float, num_grids: int, spacing: str) -> Dict[str, float]:
+    """Describe the distance between levels: a price step or a price ratio"""
+    if spacing == 'geometric':
+        return {'ratio': (upper / lower) ** (1 / (num_grids - 1))}
+    return {'priceStep': (upper - lower) / (num_grids - 1)}
+
+
+def _levels_to_dicts(levels: np.ndarray) -> List[Dict[str, Any]]:
+    """Expand a grid level record array into plain dicts for callers"""
+    return [
+        {
+            'level': level,
+            'price': price,
+            'quantity': quantity,
+            'side': _SIDE_NAMES[side],
+            'status': _STATUS_NAMES[status],
+            'order_id': None if order_id == _NO_ORDER_ID else order_id
+        }
+        for level, price, quantity, side, status, order_id in levels.tolist()
+    ]
+
+
+def _export_strategy(strategy: Dict[str, Any]) -> Dict[str, Any]:
+    """Shallow copy of a strategy with its grid levels as JSON-friendly dicts"""
+    exported = dict(strategy)
+    exported['gridLevels'] = _levels_to_dicts(strategy['gridLevels'])
+    return exported
+
 
 class GridStrategy:
     """Grid strategy handler - automated trading within price range"""
 
+    __slots__ = ('api_client', 'limit_orders', 'strategy_history', 'grid_levels')
+
+    # Number of strategies retained in history before the oldest are dropped
+    MAX_HISTORY = 10_000
+
     def __init__(self, api_client=None):
         """
         Initialize grid strategy handler
@@ -24,7 +107,7 @@ class GridStrategy:
         """
         self.api_client = api_client
         self.limit_orders = LimitOrder(api_client)
-        self.strategy_history = []
+        self.strategy_history = deque(maxlen=self.MAX_HISTORY)
         self.grid_levels = {}
 
     def place_order(
@@ -35,7 +118,8 @@ class GridStrategy:
         num_grids: int,
         total_quantity: float,
         grid_type: str = 'LONG',
-        test_mode: bool = False
+        test_mode: bool = False,
+        spacing: str = 'arithmetic'
     ) -> Dict[str, Any]:
         """
         Place a grid strategy.
@@ -48,6 +132,7 @@ class GridStrategy:
             total_quantity: Total quantity to deploy
             grid_type: 'LONG' (buy-low/sell-high) or 'SHORT' (sell-high/buy-low)
             test_mode: If True, simulate without API
+            spacing: 'arithmetic' (equal price steps) or 'geometric' (equal price ratios)
             
         Returns:
             Grid strategy details
@@ -63,7 +148,7 @@ class GridStrategy:
             total_qty = OrderValidator.validate_quantity(total_quantity, symbol)
             num_grids = int(num_grids)
         except (ValidationError, ValueError) as e:
-            logger.error(f"Grid strategy validation failed: {e}")
+            logger.error("Grid strategy validation failed: %s", e)
             raise
 
         if lower >= upper:
@@ -78,32 +163,34 @@ class GridStrategy:
         if grid_type not in ['LONG', 'SHORT']:
             raise ValidationError("Grid type must be 'LONG' or 'SHORT'")
 
+        if spacing not in GRID_SPACINGS:
+            raise ValidationError("Grid spacing must be 'arithmetic' or 'geometric'")
+
         # Calculate grid parameters
-        price_range = upper - lower
-        price_step = price_range / (num_grids - 1)
+        step_params = _spacing_params(lower, upper, num_grids, spacing)
         qty_per_grid = total_qty / num_grids
 
-        # Create grid levels
-        grid_levels = []
-        for i in range(num_grids):
-            price = lower + (price_step * i)
-            grid_levels.append({
-                'level': i,
-                'price': price,
-                'quantity': qty_per_grid,
-                'side': 'BUY' if grid_type == 'LONG' else 'SELL',
-                'status': 'PENDING',
-                'order_id': None
-            })
+        # Level prices lie within the validated bounds and every level has the
+        # same quantity, so one check covers all sub-orders before any is placed
+        OrderValidator.validate_quantity(qty_per_grid, symbol)
+
+        # Create grid levels (all prices computed in one vectorized call)
+        grid_levels = np.zeros(num_grids, dtype=GRID_LEVEL_DTYPE)
+        grid_levels['level'] = np.arange(num_grids)
+        grid_levels['price'] = _grid_prices(lower, upper, num_grids, spacing)
+        grid_levels['quantity'] = qty_per_grid
+        grid_levels['side'] = LevelSide.BUY if grid_type == 'LONG' else LevelSide.SELL
+        grid_levels['order_id'] = _NO_ORDER_ID
 
+        # Constant-key literal (built in one step); the spacing-dependent key is added after
         strategy = {
-            'strategyId': int(datetime.now().timestamp() * 1000),
+            'strategyId': time_ns() // 1_000_000,
             'symbol': symbol,
             'gridType': grid_type,
             'lowerPrice': lower,
             'upperPrice': upper,
             'numGrids': num_grids,
-            'priceStep': price_step,
+            'spacing': spacing,
             'totalQuantity': total_qty,
             'quantityPerGrid': qty_per_grid,
             'status': 'ACTIVE',
@@ -111,29 +198,35 @@ class GridStrategy:
             'gridLevels': grid_levels,
             'orders': []
         }
+        strategy.update(step_params)
 
         logger.log_order('GRID', symbol, grid_type, total_qty, {
             'lowerPrice': lower,
             'upperPrice': upper,
             'numGrids': num_grids,
-            'priceStep': price_step,
+            'spacing': spacing,
+            **step_params,
             'qtyPerGrid': qty_per_grid
         })
 
         # Place orders for each grid level
         self._place_grid_orders(strategy, test_mode)
 
+        if len(self.strategy_history) == self.MAX_HISTORY:
+            evicted = self.strategy_history[0]
+            if self.grid_levels.get(evicted['strategyId']) is evicted:
+                del self.grid_levels[evicted['strategyId']]
         self.strategy_history.append(strategy)
         self.grid_levels[strategy['strategyId']] = strategy
 
         logger.info(
-            f"Grid strategy initiated: {symbol} {grid_type} | "
-            f"Range: {lower}-{upper} | Grids: {num_grids} | "
-            f"Step: {price_step:.2f} | QtyPerGrid: {qty_per_grid} | "
-            f"Strategy ID: {strategy['strategyId']}"
+            "Grid strategy initiated: %s %s | Range: %s-%s | Grids: %s | "
+            "Spacing: %s %s | QtyPerGrid: %s | Strategy ID: %s",
+            symbol, grid_type, lower, upper, num_grids,
+            spacing, step_params, qty_per_grid, strategy['strategyId']
         )
 
-        return strategy
+        return _export_strategy(strategy)
 
     def _place_grid_orders(self, strategy: Dict[str, Any], test_mode: bool):
         """
@@ -143,36 +236,63 @@ class GridStrategy:
             strategy: Strategy details
             test_mode: If True, simulate
         """
-        for level in strategy['gridLevels']:
+        levels = strategy['gridLevels']
+        symbol = strategy['symbol']
+        sides = [_SIDE_NAMES[code] for code in levels['side'].tolist()]
+        quantities = levels['quantity'].tolist()
+        prices = levels['price'].tolist()
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+
+        # Send levels in batches of BATCH_CREATE_MAX; each batch is one HTTP
+        # round-trip and the batches run concurrently
+        responses = []
+        if not test_mode and self.limit_orders:
+            orders = [
+                {'symbol': symbol, 'side': side, 'quantity': quantity, 'price': price, 'post_only': True}
+                for side, quantity, price in zip(sides, quantities, prices)
+            ]
+            starts = range(0, len(orders), BATCH_CREATE_MAX)
+            with ThreadPoolExecutor(max_workers=GRID_ORDER_WORKERS) as executor:
+                batches = [
+                    executor.submit(self.limit_orders.place_batch, orders[start:start + BATCH_CREATE_MAX])
+                    for start in starts
+                ]
+
+            # Flatten back to one result per level, in level order
+            for start, batch in zip(starts, batches):
+                try:
+                    responses.extend(batch.result())
+                except Exception as e:
+                    responses.extend([e] * len(orders[start:start + BATCH_CREATE_MAX]))
+
+        for i in range(len(levels)):
             try:
-                if not test_mode and self.limit_orders:
-                    order = self.limit_orders.place_order(
-                        symbol=strategy['symbol'],
-                        side=level['side'],
-                        quantity=level['quantity'],
-                        price=level['price'],
-                        post_only=True
-                    )
-                    level['order_id'] = order.get('orderId')
-                    level['status'] = 'PLACED'
+                if responses:
+                    order = responses[i]
+                    if isinstance(order, Exception):
+                        raise order
+                    if 'code' in order:
+                        raise Exception(f"Order rejected: {order.get('msg')}")
+                    order_id = order.get('orderId')
+                    levels['order_id'][i] = _NO_ORDER_ID if order_id is None else order_id
                     strategy['orders'].append(order)
                 else:
                     # Simulate
-                    level['order_id'] = 10000000 + level['level']
-                    level['status'] = 'PLACED'
-
-                logger.debug(
-                    f"Grid level {level['level']}: {strategy['symbol']} "
-                    f"{level['side']} {level['quantity']} @ {level['price']} | "
-                    f"Order ID: {level['order_id']}"
-                )
+                    order_id = 10000000 + i
+                    levels['order_id'][i] = order_id
+                levels['status'][i] = LevelStatus.PLACED
+
+                if debug_enabled:
+                    logger.debug(
+                        "Grid level %s: %s %s %s @ %s | Order ID: %s",
+                        i, symbol, sides[i], quantities[i], prices[i], order_id
+                    )
 
             except Exception as e:
                 logger.error(
-                    f"Failed to place grid order for level {level['level']}: {e}",
-                    exc_info=True
+                    "Failed to place grid order for level %s: %s", i, e, exc_info=True
                 )
-                level['status'] = 'FAILED'
+                levels['status'][i] = LevelStatus.FAILED
 
     def update_grid(
         self,
@@ -191,43 +311,40 @@ class GridStrategy:
         Returns:
             Updated strategy
         """
-        for strategy in self.strategy_history:
-            if strategy['strategyId'] == strategy_id:
-                # Cancel existing orders
-                self._cancel_grid_orders(strategy)
-
-                # Update prices
-                if new_lower:
-                    strategy['lowerPrice'] = new_lower
-                if new_upper:
-                    strategy['upperPrice'] = new_upper
-
-                # Recalculate and place new orders
-                lower = strategy['lowerPrice']
-                upper = strategy['upperPrice']
-                num_grids = strategy['numGrids']
-
-                price_range = upper - lower
-                price_step = price_range / (num_grids - 1)
-
-                # Update grid levels
-                for i in range(num_grids):
-                    price = lower + (price_step * i)
-                    strategy['gridLevels'][i]['price'] = price
-
-                strategy['priceStep'] = price_step
-
-                # Place new orders
-                self._place_grid_orders(strategy, False)
-
-                logger.info(
-                    f"Grid strategy {strategy_id} updated: {strategy['lowerPrice']}-"
-                    f"{strategy['upperPrice']}"
-                )
+        strategy = self.grid_levels.get(strategy_id)
+        if strategy is None:
+            raise ValueError(f"Strategy {strategy_id} not found")
+
+        # Cancel existing orders
+        self._cancel_grid_orders(strategy)
+
+        # Update prices
+        if new_lower:
+            strategy['lowerPrice'] = new_lower
+        if new_upper:
+            strategy['upperPrice'] = new_upper
+
+        # Recalculate and place new orders
+        lower = strategy['lowerPrice']
+        upper = strategy['upperPrice']
+        num_grids = strategy['numGrids']
+
+        spacing = strategy.get('spacing', 'arithmetic')
+
+        # Update grid levels
+        strategy['gridLevels']['price'] = _grid_prices(lower, upper, num_grids, spacing)
 
-                return strategy
+        strategy.update(_spacing_params(lower, upper, num_grids, spacing))
 
-        raise ValueError(f"Strategy {strategy_id} not found")
+        # Place new orders
+        self._place_grid_orders(strategy, False)
+
+        logger.info(
+            "Grid strategy %s updated: %s-%s",
+            strategy_id, strategy['lowerPrice'], strategy['upperPrice']
+        )
+
+        return _export_strategy(strategy)
 
     def cancel_strategy(self, strategy_id: int) -> Dict[str, Any]:
         """
@@ -239,36 +356,44 @@ class GridStrategy:
         Returns:
             Cancellation result
         """
-        for strategy in self.strategy_history:
-            if strategy['strategyId'] == strategy_id:
-                self._cancel_grid_orders(strategy)
-                strategy['status'] = 'CANCELLED'
-                strategy['endTime'] = datetime.now().isoformat()
+        strategy = self.grid_levels.get(strategy_id)
+        if strategy is None:
+            raise ValueError(f"Strategy {strategy_id} not found")
 
-                logger.info(f"Grid strategy {strategy_id} cancelled")
+        self._cancel_grid_orders(strategy)
+        strategy['status'] = 'CANCELLED'
+        strategy['endTime'] = datetime.now().isoformat()
 
-                return {'status': 'CANCELLED', 'strategyId': strategy_id}
+        logger.info("Grid strategy %s cancelled", strategy_id)
 
-        raise ValueError(f"Strategy {strategy_id} not found")
+        return {'status': 'CANCELLED', 'strategyId': strategy_id}
 
     def _cancel_grid_orders(self, strategy: Dict[str, Any]):
         """Cancel all orders in a grid strategy"""
-        for order in strategy['orders']:
-            try:
-                self.limit_orders.cancel_order(
+        orders = strategy['orders']
+        if not orders:
+            return
+
+        with ThreadPoolExecutor(max_workers=GRID_ORDER_WORKERS) as executor:
+            futures = [
+                executor.submit(
+                    self.limit_orders.cancel_order,
                     strategy['symbol'],
                     order['orderId']
                 )
+                for order in orders
+            ]
+
+        for order, future in zip(orders, futures):
+            try:
+                future.result()
             except Exception as e:
-                logger.warning(f"Could not cancel order {order['orderId']}: {e}")
+                logger.warning("Could not cancel order %s: %s", order['orderId'], e)
 
     def get_strategy_status(self, strategy_id: int) -> Dict[str, Any]:
         """Get status of a grid strategy"""
-        for strategy in self.strategy_history:
-            if strategy['strategyId'] == strategy_id:
-                return strategy
-
-        return {}
+        strategy = self.grid_levels.get(strategy_id)
+        return _export_strategy(strategy) if strategy is not None else {}
 
     def get_profit_loss(self, strategy_id: int) -> Dict[str, Any]:
         """
@@ -280,23 +405,26 @@ class GridStrategy:
         Returns:
             P&L details
         """
-        strategy = self.get_strategy_status(strategy_id)
-        if not strategy:
+        strategy = self.grid_levels.get(strategy_id)
+        if strategy is None:
             raise ValueError(f"Strategy {strategy_id} not found")
 
-        # Calculate buy and sell totals
-        buy_total = 0
-        sell_total = 0
-        buy_qty = 0
-        sell_qty = 0
+        # Calculate buy and sell totals; Binance reports quantities and
+        # prices as strings
+        buy_total = 0.0
+        sell_total = 0.0
+        buy_qty = 0.0
+        sell_qty = 0.0
 
         for order in strategy['orders']:
+            qty = float(order.get('executedQty', 0))
+            notional = qty * float(order.get('avgPrice', 0))
             if order.get('side') == 'BUY':
-                buy_total += order.get('executedQty', 0) * order.get('avgPrice', 0)
-                buy_qty += order.get('executedQty', 0)
+                buy_total += notional
+                buy_qty += qty
             else:
-                sell_total += order.get('executedQty', 0) * order.get('avgPrice', 0)
-                sell_qty += order.get('executedQty', 0)
+                sell_total += notional
+                sell_qty += qty
 
         pnl = sell_total - buy_total if buy_qty > 0 and sell_qty > 0 else 0
 
@@ -312,8 +440,8 @@ class GridStrategy:
 
     def get_all_strategies(self) -> List[Dict[str, Any]]:
         """Get all grid strategies"""
-        return self.strategy_history
+        return [_export_strategy(s) for s in self.strategy_history]
 
     def get_active_strategies(self) -> List[Dict[str, Any]]:
         """Get currently active grid strategies"""
-        return [s for s in self.strategy_history if s['status'] == 'ACTIVE']
+        return [_export_strategy(s) for s in self.strategy_history if s['status'] == 'ACTIVE']
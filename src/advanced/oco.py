@@ -3,8 +3,9 @@ OCO (One-Cancels-the-Other) Order implementation for Binance Futures Trading Bot
 Places take-profit and stop-loss orders simultaneously
 """
 
+from collections import deque
 from typing import Dict, Any, Optional
-from datetime import datetime
+from time import time_ns
 from validation import validate_limit_order, ValidationError, OrderValidator
 from logger import get_logger
 
@@ -14,6 +15,11 @@ logger = get_logger()
 class OCOOrder:
     """OCO order handler - simultaneous take-profit and stop-loss orders"""
 
+    __slots__ = ('api_client', 'order_history', '_by_list_id')
+
+    # Number of responses retained in history before the oldest are dropped
+    MAX_HISTORY = 10_000
+
     def __init__(self, api_client=None):
         """
         Initialize OCO order handler
@@ -22,7 +28,8 @@ class OCOOrder:
             api_client: Binance API client
         """
         self.api_client = api_client
-        self.order_history = []
+        self.order_history = deque(maxlen=self.MAX_HISTORY)
+        self._by_list_id = {}
 
     def place_order(
         self,
@@ -60,11 +67,11 @@ class OCOOrder:
             tp_price = OrderValidator.validate_price(take_profit_price, symbol)
             sl_price = OrderValidator.validate_price(stop_loss_price, symbol)
         except ValidationError as e:
-            logger.error(f"OCO order validation failed: {e}")
+            logger.error("OCO order validation failed: %s", e)
             raise
 
         # Validate OCO logic
-        self._validate_oco_logic(side, take_profit_price, stop_loss_price)
+        self._validate_oco_logic(side, tp_price, sl_price)
 
         sl_limit = stop_loss_limit_price or stop_loss_price
 
@@ -93,23 +100,20 @@ class OCOOrder:
         For SELL side: take-profit < entry, stop-loss > entry
         
         Args:
-            side: BUY or SELL
+            side: BUY or SELL (already normalized by validate_side)
             tp_price: Take-profit price
             sl_price: Stop-loss price
             
         Raises:
             ValidationError: If logic is invalid
         """
-        if side.upper() == 'BUY':
-            if tp_price <= sl_price:
-                raise ValidationError(
-                    f"For BUY: take-profit ({tp_price}) must be > stop-loss ({sl_price})"
-                )
-        else:  # SELL
-            if tp_price >= sl_price:
-                raise ValidationError(
-                    f"For SELL: take-profit ({tp_price}) must be < stop-loss ({sl_price})"
-                )
+        # +1 for BUY, -1 for SELL: the TP/SL spread must have the same sign
+        sign = 1 if side == 'BUY' else -1
+        if (tp_price - sl_price) * sign <= 0:
+            relation = '>' if sign > 0 else '<'
+            raise ValidationError(
+                f"For {side}: take-profit ({tp_price}) must be {relation} stop-loss ({sl_price})"
+            )
 
     def _simulate_oco_order(
         self,
@@ -154,17 +158,28 @@ class OCOOrder:
             ],
             'listStatus': 'EXECUTING',
             'listOrderStatus': 'NEW',
-            'updateTime': int(datetime.now().timestamp() * 1000)
+            'updateTime': time_ns() // 1_000_000
         }
 
         logger.info(
-            f"Simulated OCO order: {symbol} {side} {quantity} | "
-            f"TP: {tp_price} | SL: {sl_price} | ListID: {response['orderListId']}"
+            "Simulated OCO order: %s %s %s | TP: %s | SL: %s | ListID: %s",
+            symbol, side, quantity, tp_price, sl_price, response['orderListId']
         )
 
-        self.order_history.append(response)
+        self._record(response)
         return response
 
+    def _record(self, response: Dict[str, Any]):
+        """Store an OCO response in history and index it by order list ID"""
+        if len(self.order_history) == self.MAX_HISTORY:
+            evicted = self.order_history[0]
+            if self._by_list_id.get(evicted.get('orderListId')) is evicted:
+                del self._by_list_id[evicted['orderListId']]
+        self.order_history.append(response)
+        list_id = response.get('orderListId')
+        if list_id is not None:
+            self._by_list_id[list_id] = response
+
     def _place_via_api(
         self,
         symbol: str,
@@ -188,9 +203,6 @@ class OCOOrder:
         Returns:
             API response
         """
-        if not self.api_client:
-            raise Exception("API client not configured")
-
         try:
             params = {
                 'symbol': symbol,
@@ -208,15 +220,15 @@ class OCOOrder:
 
             logger.log_api_response('futures/order', 200, response)
             logger.info(
-                f"OCO order placed: {symbol} {side} {quantity} | "
-                f"TP: {tp_price} | SL: {sl_price} | ListID: {response.get('orderListId')}"
+                "OCO order placed: %s %s %s | TP: %s | SL: %s | ListID: %s",
+                symbol, side, quantity, tp_price, sl_price, response.get('orderListId')
             )
 
-            self.order_history.append(response)
+            self._record(response)
             return response
 
         except Exception as e:
-            logger.error(f"API error placing OCO order: {e}", exc_info=True)
+            logger.error("API error placing OCO order: %s", e, exc_info=True)
             raise
 
     def cancel_order(self, symbol: str, order_list_id: int) -> Dict[str, Any]:
@@ -238,10 +250,10 @@ class OCOOrder:
                 symbol=symbol,
                 orderListId=order_list_id
             )
-            logger.info(f"OCO order list {order_list_id} cancelled")
+            logger.info("OCO order list %s cancelled", order_list_id)
             return response
         except Exception as e:
-            logger.error(f"Error cancelling OCO order: {e}", exc_info=True)
+            logger.error("Error cancelling OCO order: %s", e, exc_info=True)
             raise
 
     def get_order_status(self, symbol: str, order_list_id: int) -> Dict[str, Any]:
@@ -255,9 +267,9 @@ class OCOOrder:
         Returns:
             OCO order status
         """
-        for order in self.order_history:
-            if order.get('orderListId') == order_list_id:
-                return order
+        order = self._by_list_id.get(order_list_id)
+        if order is not None:
+            return order
 
         if self.api_client:
             try:
@@ -267,11 +279,11 @@ class OCOOrder:
                 )
                 return response
             except Exception as e:
-                logger.error(f"Error fetching OCO order: {e}", exc_info=True)
+                logger.error("Error fetching OCO order: %s", e, exc_info=True)
                 raise
 
         return {}
 
     def get_order_history(self) -> list:
         """Get all OCO orders"""
-        return self.order_history
+        return list(self.order_history)
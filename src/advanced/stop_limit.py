@@ -3,8 +3,9 @@ Stop-Limit Order implementation for Binance Futures Trading Bot
 Triggers a limit order when price reaches stop price
 """
 
+from collections import deque
 from typing import Dict, Any, Optional
-from datetime import datetime
+from time import time_ns
 from validation import validate_stop_limit_order, ValidationError, OrderValidator
 from logger import get_logger
 
@@ -14,6 +15,11 @@ logger = get_logger()
 class StopLimitOrder:
     """Stop-Limit order handler - limit order triggered by stop price"""
 
+    __slots__ = ('api_client', 'order_history', '_by_order_id')
+
+    # Number of responses retained in history before the oldest are dropped
+    MAX_HISTORY = 10_000
+
     def __init__(self, api_client=None):
         """
         Initialize stop-limit order handler
@@ -22,7 +28,8 @@ class StopLimitOrder:
             api_client: Binance API client
         """
         self.api_client = api_client
-        self.order_history = []
+        self.order_history = deque(maxlen=self.MAX_HISTORY)
+        self._by_order_id = {}
 
     def place_order(
         self,
@@ -60,7 +67,7 @@ class StopLimitOrder:
                 symbol, side, quantity, stop_price, limit_price
             )
         except ValidationError as e:
-            logger.error(f"Stop-limit order validation failed: {e}")
+            logger.error("Stop-limit order validation failed: %s", e)
             raise
 
         symbol = validated['symbol']
@@ -121,20 +128,31 @@ class StopLimitOrder:
             'executedQty': 0,
             'status': 'NEW',
             'timeInForce': 'GTC',
-            'updateTime': int(datetime.now().timestamp() * 1000),
+            'updateTime': time_ns() // 1_000_000,
             'avgPrice': 0,
             'totalFill': 0,
             'workingType': working_type
         }
 
         logger.info(
-            f"Simulated STOP-LIMIT order: {symbol} {side} {quantity} | "
-            f"Stop: {stop_price} | Limit: {limit_price} | Order ID: {response['orderId']}"
+            "Simulated STOP-LIMIT order: %s %s %s | Stop: %s | Limit: %s | Order ID: %s",
+            symbol, side, quantity, stop_price, limit_price, response['orderId']
         )
 
-        self.order_history.append(response)
+        self._record(response)
         return response
 
+    def _record(self, response: Dict[str, Any]):
+        """Store an order response in history and index it by order ID"""
+        if len(self.order_history) == self.MAX_HISTORY:
+            evicted = self.order_history[0]
+            if self._by_order_id.get(evicted.get('orderId')) is evicted:
+                del self._by_order_id[evicted['orderId']]
+        self.order_history.append(response)
+        order_id = response.get('orderId')
+        if order_id is not None:
+            self._by_order_id[order_id] = response
+
     def _place_via_api(
         self,
         symbol: str,
@@ -160,9 +178,6 @@ class StopLimitOrder:
         Returns:
             API response
         """
-        if not self.api_client:
-            raise Exception("API client not configured")
-
         try:
             params = {
                 'symbol': symbol,
@@ -181,22 +196,22 @@ class StopLimitOrder:
 
             logger.log_api_response('futures/order', 200, response)
             logger.info(
-                f"STOP-LIMIT order placed: {symbol} {side} {quantity} | "
-                f"Stop: {stop_price} | Limit: {limit_price} | Order ID: {response['orderId']}"
+                "STOP-LIMIT order placed: %s %s %s | Stop: %s | Limit: %s | Order ID: %s",
+                symbol, side, quantity, stop_price, limit_price, response['orderId']
             )
 
-            self.order_history.append(response)
+            self._record(response)
             return response
 
         except Exception as e:
-            logger.error(f"API error placing stop-limit order: {e}", exc_info=True)
+            logger.error("API error placing stop-limit order: %s", e, exc_info=True)
             raise
 
     def get_order_status(self, symbol: str, order_id: int) -> Dict[str, Any]:
         """Get order status"""
-        for order in self.order_history:
-            if order.get('orderId') == order_id:
-                return order
+        order = self._by_order_id.get(order_id)
+        if order is not None:
+            return order
 
         if self.api_client:
             try:
@@ -206,7 +221,7 @@ class StopLimitOrder:
                 )
                 return response
             except Exception as e:
-                logger.error(f"Error fetching order: {e}", exc_info=True)
+                logger.error("Error fetching order: %s", e, exc_info=True)
                 raise
 
         return {}
@@ -221,12 +236,12 @@ class StopLimitOrder:
                 symbol=symbol,
                 orderId=order_id
             )
-            logger.info(f"Stop-limit order {order_id} cancelled")
+            logger.info("Stop-limit order %s cancelled", order_id)
             return response
         except Exception as e:
-            logger.error(f"Error cancelling order: {e}", exc_info=True)
+            logger.error("Error cancelling order: %s", e, exc_info=True)
             raise
 
     def get_order_history(self) -> list:
         """Get all stop-limit orders"""
-        return self.order_history
+        return list(self.order_history)
@@ -3,21 +3,280 @@ TWAP (Time-Weighted Average Price) Strategy for Binance Futures Trading Bot
 Splits large orders into smaller chunks over time
 """
 
+import math
 import time
 import threading
-from typing import Dict, Any, List, Optional, Callable
-from datetime import datetime
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
 from validation import validate_market_order, validate_limit_order, ValidationError, OrderValidator
 from logger import get_logger
 from market_orders import MarketOrder
 from limit_orders import LimitOrder
+from api_client import BATCH_CANCEL_MAX, retry_delay
 
 logger = get_logger()
 
+# Worker threads submitting TWAP splits; strategies hold none between splits
+TWAP_WORKERS = 16
+
+
+def _iso_timestamp(ns: int) -> str:
+    """Local ISO-8601 timestamp (same format as datetime.isoformat) from time_ns()"""
+    seconds, rem = divmod(ns, 1_000_000_000)
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(seconds)) + f'.{rem // 1000:06d}'
+
+
+# Retries per split for transient API failures
+SPLIT_RETRIES = 3
+
+# Lot step used when exchange filters are unavailable (simulation mode)
+DEFAULT_QTY_STEP = OrderValidator.MIN_QUANTITY
+
+
+def _step_decimals(step: str) -> int:
+    """Decimal places of a stepSize string such as '0.00100000'"""
+    return len(step.rstrip('0').partition('.')[2])
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting how fast requests are sent"""
+
+    def __init__(self, rate: float, burst: int):
+        """
+        Initialize token bucket
+        
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens held at once
+        """
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take one token, blocking until one is available"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            # Sleep outside the lock so other callers can refill and check
+            time.sleep(wait)
+
+
+# Shared by all strategies to stay under Binance's 10 orders/sec limit
+_ORDER_BUCKET = TokenBucket(rate=9, burst=9)
+
+
+class TimingWheel:
+    """Hierarchical timing wheel firing callbacks at monotonic deadlines"""
+
+    def __init__(self, tick: float = 0.01, slots: Tuple[int, ...] = (100, 60, 60, 24)):
+        """
+        Initialize timing wheel
+        
+        Args:
+            tick: Resolution in seconds
+            slots: Slots per level; one slot spans a full turn of the level
+                below (defaults: 10ms, 1s, 1min and 1h slots, one day in total)
+        """
+        self.tick = tick
+        self._slots = slots
+        self._spans = [math.prod(slots[:level]) for level in range(len(slots))]
+        self._horizon = math.prod(slots)
+        self._wheels = [[[] for _ in range(n)] for n in slots]
+        self._origin = time.monotonic()
+        self._now = 0  # Ticks processed so far
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, deadline: float, callback: Callable):
+        """
+        Run a callback on the wheel thread once a deadline is reached.
+        
+        Args:
+            deadline: time.monotonic() value to fire at
+            callback: Callable taking no arguments; should return quickly
+        """
+        with self._cond:
+            if not self._pending:
+                # Idle wheel: skip the ticks that passed with nothing to fire
+                self._now = max(self._now, self._current_tick())
+            target = max(self._now + 1, math.ceil((deadline - self._origin) / self.tick))
+            self._insert(target, callback)
+            self._pending += 1
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='twap-wheel', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def _current_tick(self) -> int:
+        """Ticks elapsed since the wheel was created"""
+        return int((time.monotonic() - self._origin) / self.tick)
+
+    def _insert(self, target: int, callback: Callable):
+        """Place a timer in the lowest level whose range covers it"""
+        delta = target - self._now
+        for level, n in enumerate(self._slots):
+            span = self._spans[level]
+            if delta < span * n:
+                self._wheels[level][(target // span) % n].append((target, callback))
+                return
+
+        # Beyond the horizon: park in the farthest top-level slot; it is
+        # re-inserted from there when that slot cascades
+        top = len(self._slots) - 1
+        slot = (self._now + self._horizon - 1) // self._spans[top] % self._slots[top]
+        self._wheels[top][slot].append((target, callback))
+
+    def _advance(self) -> List[Tuple[int, Callable]]:
+        """Move forward one tick and return the timers now due"""
+        self._now += 1
+        now = self._now
+
+        # Cascade higher levels whose slot boundary was reached, top down,
+        # so timers can drop several levels in one tick
+        for level in range(len(self._slots) - 1, 0, -1):
+            span = self._spans[level]
+            if now % span == 0:
+                slot = self._wheels[level][now // span % self._slots[level]]
+                entries = slot[:]
+                slot.clear()
+                for target, callback in entries:
+                    self._insert(target, callback)
+
+        slot = self._wheels[0][now % self._slots[0]]
+        due = slot[:]
+        slot.clear()
+        return due
+
+    def _next_event_tick(self) -> Optional[int]:
+        """First tick after now that fires a timer or cascades a populated slot"""
+        now = self._now
+        n = self._slots[0]
+        wheel = self._wheels[0]
+        best = None
+        for tick in range(now + 1, now + n + 1):
+            if wheel[tick % n]:
+                best = tick
+                break
+
+        for level in range(1, len(self._slots)):
+            span, n, wheel = self._spans[level], self._slots[level], self._wheels[level]
+            for k in range(1, n + 1):
+                boundary = (now // span + k) * span
+                if best is not None and boundary >= best:
+                    break
+                if wheel[boundary // span % n]:
+                    best = boundary
+                    break
+        return best
+
+    def _run(self):
+        """Wheel thread: sleep until the next populated slot, then fire due callbacks"""
+        while True:
+            with self._cond:
+                while True:
+                    if not self._pending:
+                        self._cond.wait()
+                        continue
+                    current = self._current_tick()
+                    next_event = self._next_event_tick()
+                    if next_event <= current:
+                        break
+                    # schedule() notifies, so an earlier timer cuts this short
+                    self._cond.wait(self._origin + next_event * self.tick - time.monotonic())
+
+                # Jump straight between event ticks; the ones skipped have
+                # nothing to fire or cascade
+                due = []
+                while next_event is not None and next_event <= current:
+                    self._now = next_event - 1
+                    due.extend(self._advance())
+                    next_event = self._next_event_tick()
+                self._now = current
+                self._pending -= len(due)
+
+            # Callbacks run outside the lock so they can schedule again
+            for _, callback in due:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error("Timing wheel callback failed: %s", e, exc_info=True)
+
+
+@dataclass(slots=True)
+class TWAPPlan:
+    """Execution plan and live state of one TWAP strategy"""
+    strategyId: int
+    symbol: str
+    side: str
+    totalQuantity: float
+    numSplits: int
+    quantityPerSplit: float
+    quantities: Tuple[float, ...]
+    interval: int
+    orderType: str
+    price: Optional[float]
+    status: str
+    startTime: str
+    orders: List[Dict[str, Any]] = field(default_factory=list)
+    completionTime: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain-dict snapshot for callers and JSON output"""
+        return {
+            'strategyId': self.strategyId,
+            'symbol': self.symbol,
+            'side': self.side,
+            'totalQuantity': self.totalQuantity,
+            'numSplits': self.numSplits,
+            'quantityPerSplit': self.quantityPerSplit,
+            'quantities': self.quantities,
+            'interval': self.interval,
+            'orderType': self.orderType,
+            'price': self.price,
+            'status': self.status,
+            'startTime': self.startTime,
+            'orders': list(self.orders),
+            'completionTime': self.completionTime
+        }
+
+
+@dataclass(slots=True)
+class _TWAPRun:
+    """Execution state of a started TWAP strategy"""
+    plan: TWAPPlan
+    place_split: Callable
+    split_kwargs: Dict[str, Any]
+    callback: Optional[Callable]
+    stop_event: threading.Event = field(default_factory=threading.Event)
+    done: threading.Event = field(default_factory=threading.Event)
+    start: float = 0.0
+
 
 class TWAPStrategy:
     """TWAP strategy handler - executes orders over time"""
 
+    __slots__ = (
+        'api_client', 'market_orders', 'limit_orders', 'order_history',
+        'active_orders', 'executor', 'wheel', '_by_id', '_active_ids',
+        '_status_counts', '_lock', '_last_id'
+    )
+
+    MAX_HISTORY = 10_000
+
     def __init__(self, api_client=None):
         """
         Initialize TWAP strategy handler
@@ -28,9 +287,18 @@ class TWAPStrategy:
         self.api_client = api_client
         self.market_orders = MarketOrder(api_client)
         self.limit_orders = LimitOrder(api_client)
-        self.order_history = []
-        self.active_orders = {}
-        self.stop_event = threading.Event()
+        self.order_history = deque(maxlen=self.MAX_HISTORY)
+        self.active_orders: Dict[int, _TWAPRun] = {}
+        self._by_id: Dict[int, TWAPPlan] = {}
+        self._active_ids: Set[int] = set()
+        # Number of indexed plans per status, kept current by _set_status
+        self._status_counts: Counter = Counter()
+        # Re-entrant so _set_status can be called with the lock already held
+        self._lock = threading.RLock()
+        self._last_id = 0
+        self.executor = ThreadPoolExecutor(max_workers=TWAP_WORKERS, thread_name_prefix='twap')
+        # Next-split timers for every running strategy
+        self.wheel = TimingWheel()
 
     def place_order(
         self,
@@ -52,7 +320,7 @@ class TWAPStrategy:
             side: 'BUY' or 'SELL'
             total_quantity: Total quantity to execute
             num_splits: Number of orders to split into
-            interval_seconds: Seconds between each order
+            interval_seconds: Seconds between each order (0 sends all splits at once)
             order_type: 'MARKET' or 'LIMIT'
             price: Limit price (required if order_type='LIMIT')
             test_mode: If True, simulate without API
@@ -70,9 +338,14 @@ class TWAPStrategy:
             side = OrderValidator.validate_side(side)
             total_qty = OrderValidator.validate_quantity(total_quantity, symbol)
             num_splits = int(num_splits)
-            interval = OrderValidator.validate_interval(interval_seconds)
+            # Interval 0 is allowed here: slices are sent immediately, which
+            # is useful to stay under per-order size limits
+            interval = (
+                0 if int(interval_seconds) == 0
+                else OrderValidator.validate_interval(interval_seconds)
+            )
         except (ValidationError, ValueError) as e:
-            logger.error(f"TWAP order validation failed: {e}")
+            logger.error("TWAP order validation failed: %s", e)
             raise
 
         if num_splits < 2:
@@ -81,7 +354,23 @@ class TWAPStrategy:
         if num_splits > 100:
             raise ValidationError("Number of splits cannot exceed 100")
 
-        qty_per_split = total_qty / num_splits
+        # Work in whole lots of the symbol's step size; leftover lots are
+        # spread one per slice so no slice differs from another by more
+        # than one step
+        step, min_qty, decimals = self._lot_size(symbol, order_type)
+        total_lots = math.floor(total_qty / step + 1e-9)
+        base_lots, extra_lots = divmod(total_lots, num_splits)
+        qty_per_split = round(base_lots * step, decimals)
+        if qty_per_split < min_qty:
+            raise ValidationError(
+                f"Quantity per split below minimum {min_qty}; use fewer splits"
+            )
+        if round(total_lots * step, decimals) != total_qty:
+            total_qty = round(total_lots * step, decimals)
+            logger.warning("TWAP total quantity rounded down to lot step %s: %s", step, total_qty)
+        quantities = (round((base_lots + 1) * step, decimals),) * extra_lots + (
+            (qty_per_split,) * (num_splits - extra_lots)
+        )
 
         params = {
             'totalQty': total_qty,
@@ -94,122 +383,303 @@ class TWAPStrategy:
 
         logger.log_order('TWAP', symbol, side, total_qty, params)
 
-        # Create execution plan
-        plan = {
-            'strategyId': int(datetime.now().timestamp() * 1000),
-            'symbol': symbol,
-            'side': side,
-            'totalQuantity': total_qty,
-            'numSplits': num_splits,
-            'quantityPerSplit': qty_per_split,
-            'interval': interval,
-            'orderType': order_type,
-            'price': price,
-            'status': 'PLANNED',
-            'startTime': datetime.now().isoformat(),
-            'orders': []
-        }
+        # Strategy IDs are millisecond timestamps, bumped when two strategies
+        # start in the same millisecond so every ID stays unique
+        now_ns = time.time_ns()
+        with self._lock:
+            strategy_id = max(now_ns // 1_000_000, self._last_id + 1)
+            self._last_id = strategy_id
 
-        self.order_history.append(plan)
+        # Create execution plan
+        plan = TWAPPlan(
+            strategyId=strategy_id,
+            symbol=symbol,
+            side=side,
+            totalQuantity=total_qty,
+            numSplits=num_splits,
+            quantityPerSplit=qty_per_split,
+            quantities=quantities,
+            interval=interval,
+            orderType=order_type,
+            price=price,
+            status='PLANNED',
+            startTime=_iso_timestamp(now_ns)
+        )
 
-        # Execute in background thread
-        if not test_mode:
-            thread = threading.Thread(
-                target=self._execute_twap,
-                args=(plan, order_type, price, on_fill_callback),
-                daemon=True
-            )
-            thread.start()
-            self.active_orders[plan['strategyId']] = thread
-        else:
-            self._execute_twap(plan, order_type, price, on_fill_callback)
+        # Splits differ only in quantity, so resolve the handler and the
+        # shared arguments once per strategy
+        if order_type == 'MARKET':
+            place_split = self.market_orders.place_order
+            split_kwargs = {}
+        else:  # LIMIT
+            place_split = self.limit_orders.place_order
+            split_kwargs = {'price': price}
+        split_kwargs.update(symbol=symbol, side=side, test_mode=False)
+
+        # Each strategy gets its own stop event so cancellation is per strategy
+        run = _TWAPRun(plan, place_split, split_kwargs, on_fill_callback)
+
+        with self._lock:
+            if len(self.order_history) == self.MAX_HISTORY:
+                # Oldest plan falls off the history; keep it indexed only
+                # while it is still running so it can be cancelled
+                evicted = self.order_history[0]
+                if evicted.strategyId not in self._active_ids:
+                    if self._by_id.pop(evicted.strategyId, None) is not None:
+                        self._status_counts[evicted.status] -= 1
+            self.order_history.append(plan)
+            self._by_id[plan.strategyId] = plan
+            self._active_ids.add(plan.strategyId)
+            self._status_counts[plan.status] += 1
+            self.active_orders[plan.strategyId] = run
+
+        # Execute on the shared worker pool; test mode waits for completion
+        self.executor.submit(self._execute_twap, run)
+        if test_mode:
+            run.done.wait()
 
         logger.info(
-            f"TWAP strategy initiated: {symbol} {side} {total_qty} | "
-            f"Splits: {num_splits} | Interval: {interval}s | "
-            f"PerOrder: {qty_per_split} | Strategy ID: {plan['strategyId']}"
+            "TWAP strategy initiated: %s %s %s | Splits: %s | Interval: %ss | "
+            "PerOrder: %s | Strategy ID: %s",
+            symbol, side, total_qty, num_splits, interval, qty_per_split, plan.strategyId
         )
 
-        return plan
+        return plan.to_dict()
 
-    def _execute_twap(
-        self,
-        plan: Dict[str, Any],
-        order_type: str,
-        price: Optional[float],
-        callback: Optional[Callable]
-    ):
+    def _execute_twap(self, run: _TWAPRun):
         """
-        Execute TWAP strategy with time intervals.
+        Start executing a TWAP strategy.
+        
+        Sends the first split and hands each following split to the timing
+        wheel, so no worker thread is held while waiting for the next slot.
         
         Args:
-            plan: Execution plan
-            order_type: MARKET or LIMIT
-            price: Limit price
-            callback: Optional callback on fills
+            run: Execution state of the strategy
         """
-        plan['status'] = 'EXECUTING'
-        logger.info(f"Starting TWAP execution: Strategy {plan['strategyId']}")
+        plan = run.plan
+        if run.stop_event.is_set():
+            # Cancelled while still queued on the executor
+            run.done.set()
+            return
+
+        self._set_status(plan, 'EXECUTING')
+        logger.info("Starting TWAP execution: Strategy %s", plan.strategyId)
+
+        if plan.interval > 0:
+            # Split i is due at start + i * interval, regardless of API latency
+            run.start = time.monotonic()
+            self._run_split(run, 0)
+            return
 
         try:
-            for i in range(plan['numSplits']):
-                if self.stop_event.is_set():
-                    plan['status'] = 'STOPPED'
-                    logger.warning(f"TWAP strategy {plan['strategyId']} stopped by user")
-                    break
+            # No schedule to keep, so overlap the round-trips; the token
+            # bucket still paces the submissions
+            def submit(i, qty):
+                if run.stop_event.is_set():
+                    return
+                order = self._place_split(
+                    plan, i, qty, run.place_split, run.split_kwargs, run.callback, run.stop_event
+                )
+                if order is not None:
+                    # Recorded as soon as it is placed so status and cancel see it
+                    self._record_order(plan, order)
+
+            workers = min(plan.numSplits, _ORDER_BUCKET.burst)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='twap-split') as pool:
+                list(pool.map(submit, range(plan.numSplits), plan.quantities))
+
+            self._finish(run, 'STOPPED' if run.stop_event.is_set() else 'COMPLETED')
 
-                # Execute individual order
-                try:
-                    if order_type == 'MARKET':
-                        order = self.market_orders.place_order(
-                            symbol=plan['symbol'],
-                            side=plan['side'],
-                            quantity=plan['quantityPerSplit'],
-                            test_mode=False
-                        )
-                    else:  # LIMIT
-                        order = self.limit_orders.place_order(
-                            symbol=plan['symbol'],
-                            side=plan['side'],
-                            quantity=plan['quantityPerSplit'],
-                            price=price,
-                            test_mode=False
-                        )
-
-                    plan['orders'].append(order)
-
-                    logger.info(
-                        f"TWAP split {i+1}/{plan['numSplits']} executed | "
-                        f"Order ID: {order.get('orderId')} | "
-                        f"Strategy: {plan['strategyId']}"
-                    )
+        except Exception as e:
+            self._finish(run, 'FAILED', e)
 
-                    if callback:
-                        callback(order)
+    def _run_split(self, run: _TWAPRun, index: int):
+        """
+        Send one scheduled split and schedule the next on the timing wheel.
+        
+        Args:
+            run: Execution state of the strategy
+            index: Zero-based split number
+        """
+        plan = run.plan
+        try:
+            if run.stop_event.is_set():
+                self._finish(run, 'STOPPED')
+                return
+
+            last = index == plan.numSplits - 1
+            # Retries must finish before the next split's slot
+            deadline = None if last else run.start + (index + 1) * plan.interval
+            order = self._place_split(
+                plan, index, plan.quantities[index], run.place_split,
+                run.split_kwargs, run.callback, run.stop_event, deadline
+            )
+            if order is not None:
+                self._record_order(plan, order)
 
-                except Exception as e:
-                    logger.error(
-                        f"TWAP split {i+1} failed for strategy {plan['strategyId']}: {e}",
-                        exc_info=True
-                    )
+            if last:
+                self._finish(run, 'COMPLETED')
+            else:
+                self.wheel.schedule(
+                    deadline, partial(self.executor.submit, self._run_split, run, index + 1)
+                )
 
-                # Wait before next order (except after last)
-                if i < plan['numSplits'] - 1:
-                    time.sleep(plan['interval'])
+        except Exception as e:
+            self._finish(run, 'FAILED', e)
 
-            plan['status'] = 'COMPLETED'
-            plan['completionTime'] = datetime.now().isoformat()
+    def _lot_size(self, symbol: str, order_type: str) -> Tuple[float, float, int]:
+        """
+        Quantity step, minimum quantity and step decimals for a symbol
+
+        Read from the exchange's LOT_SIZE filter (MARKET_LOT_SIZE for market
+        orders when present) via the cached symbol info; falls back to the
+        validator's minimum quantity without a client.
+        """
+        if self.api_client is not None:
+            try:
+                filters = {
+                    f['filterType']: f
+                    for f in self.api_client.get_symbol_info(symbol).get('filters', [])
+                }
+                lot = (order_type == 'MARKET' and filters.get('MARKET_LOT_SIZE')) or filters['LOT_SIZE']
+                if float(lot['stepSize']) > 0:
+                    return float(lot['stepSize']), float(lot['minQty']), _step_decimals(lot['stepSize'])
+            except Exception as e:
+                logger.warning("Could not read lot size for %s, using default step: %s", symbol, e)
+
+        step = DEFAULT_QTY_STEP
+        return step, step, _step_decimals(f'{step:f}')
+
+    def _record_order(self, plan: TWAPPlan, order: Dict[str, Any]):
+        """Attach a placed split to its plan, cancelling it if the plan was cancelled meanwhile"""
+        with self._lock:
+            plan.orders.append(order)
+            late = plan.status == 'CANCELLED'
+        if late:
+            # Placed after cancel_strategy took its snapshot of the plan's orders
+            self._cancel_orders(plan.symbol, [order['orderId']])
+
+    def _finish(self, run: _TWAPRun, status: str, error: Optional[Exception] = None):
+        """
+        Record the final status of a TWAP strategy and release it.
+        
+        Args:
+            run: Execution state of the strategy
+            status: COMPLETED, STOPPED or FAILED
+            error: Exception that failed the strategy, if any
+        """
+        plan = run.plan
+        with self._lock:
+            # cancel_strategy already recorded (and logged) a cancellation;
+            # the run winding down afterwards must not overwrite it
+            cancelled = plan.status == 'CANCELLED'
+            if not cancelled:
+                self._set_status(plan, status)
+
+        if cancelled:
+            pass
+        elif status == 'COMPLETED':
+            plan.completionTime = _iso_timestamp(time.time_ns())
             logger.info(
-                f"TWAP strategy {plan['strategyId']} completed | "
-                f"Orders executed: {len(plan['orders'])}"
+                "TWAP strategy %s completed | Orders executed: %s",
+                plan.strategyId, len(plan.orders)
             )
+        elif status == 'STOPPED':
+            logger.warning("TWAP strategy %s stopped by user", plan.strategyId)
+        else:
+            logger.error("TWAP strategy %s failed: %s", plan.strategyId, error, exc_info=error)
 
-        except Exception as e:
-            plan['status'] = 'FAILED'
-            logger.error(
-                f"TWAP strategy {plan['strategyId']} failed: {e}",
-                exc_info=True
-            )
+        with self._lock:
+            self._active_ids.discard(plan.strategyId)
+            self.active_orders.pop(plan.strategyId, None)
+        run.done.set()
+
+    def wait(self, strategy_id: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a TWAP strategy has finished.
+        
+        Args:
+            strategy_id: Strategy ID
+            timeout: Maximum seconds to wait (None waits indefinitely)
+            
+        Returns:
+            True if the strategy is no longer running
+        """
+        with self._lock:
+            run = self.active_orders.get(strategy_id)
+        return run is None or run.done.wait(timeout)
+
+    def _set_status(self, plan: TWAPPlan, status: str):
+        """Move a plan to a new status and update the per-status counts"""
+        with self._lock:
+            self._status_counts[plan.status] -= 1
+            self._status_counts[status] += 1
+            plan.status = status
+
+    def _place_split(
+        self,
+        plan: TWAPPlan,
+        index: int,
+        quantity: float,
+        place_split: Callable,
+        split_kwargs: Dict[str, Any],
+        callback: Optional[Callable],
+        stop_event: threading.Event,
+        deadline: Optional[float] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Submit one TWAP split, retrying transient failures with backoff.
+        
+        Args:
+            plan: Execution plan
+            index: Zero-based split number
+            quantity: Quantity for this split
+            place_split: Market or limit order handler method
+            split_kwargs: Arguments shared by every split
+            callback: Optional callback on fills
+            stop_event: Set to abandon retries when the strategy is stopped
+            deadline: Monotonic time after which no retry is started
+            
+        Returns:
+            Order response, or None if the split failed
+        """
+        for attempt in range(SPLIT_RETRIES + 1):
+            try:
+                _ORDER_BUCKET.acquire()
+                order = place_split(quantity=quantity, **split_kwargs)
+                break
+
+            except Exception as e:
+                # New orders: only retry failures where the order cannot have executed
+                delay = (
+                    retry_delay(e, attempt, idempotent=False) if attempt < SPLIT_RETRIES else None
+                )
+                if delay is not None and deadline is not None and time.monotonic() + delay >= deadline:
+                    delay = None
+
+                if delay is None:
+                    logger.error(
+                        "TWAP split %s failed for strategy %s: %s",
+                        index + 1, plan.strategyId, e, exc_info=True
+                    )
+                    return None
+
+                logger.warning(
+                    "TWAP split %s attempt %s failed for strategy %s: %s | Retrying in %.2fs",
+                    index + 1, attempt + 1, plan.strategyId, e, delay
+                )
+                if stop_event.wait(delay):
+                    return None
+
+        logger.info(
+            "TWAP split %s/%s executed | Order ID: %s | Strategy: %s",
+            index + 1, plan.numSplits, order.get('orderId'), plan.strategyId
+        )
+
+        if callback:
+            callback(order)
+
+        return order
 
     def cancel_strategy(self, strategy_id: int) -> Dict[str, Any]:
         """
@@ -221,26 +691,33 @@ class TWAPStrategy:
         Returns:
             Cancellation result
         """
-        for plan in self.order_history:
-            if plan['strategyId'] == strategy_id:
-                if plan['status'] in ['EXECUTING', 'PLANNED']:
-                    plan['status'] = 'CANCELLED'
-                    self.stop_event.set()
-
-                    # Cancel all pending orders
-                    for order in plan['orders']:
-                        try:
-                            self.market_orders.cancel_order(
-                                plan['symbol'],
-                                order['orderId']
-                            )
-                        except Exception as e:
-                            logger.warning(f"Could not cancel order: {e}")
-
-                    logger.info(f"TWAP strategy {strategy_id} cancelled")
-                    return {'status': 'CANCELLED', 'strategyId': strategy_id}
-
-        raise ValueError(f"Strategy {strategy_id} not found or not active")
+        with self._lock:
+            plan = self._by_id.get(strategy_id)
+            if plan is None or plan.status not in ('EXECUTING', 'PLANNED'):
+                raise ValueError(f"Strategy {strategy_id} not found or not active")
+
+            self._set_status(plan, 'CANCELLED')
+            self._active_ids.discard(strategy_id)
+            active = self.active_orders.pop(strategy_id, None)
+            # Splits recorded after this point cancel themselves (_record_order)
+            order_ids = [order['orderId'] for order in plan.orders]
+
+        if active is not None:
+            active.stop_event.set()
+
+        self._cancel_orders(plan.symbol, order_ids)
+
+        logger.info("TWAP strategy %s cancelled", strategy_id)
+        return {'status': 'CANCELLED', 'strategyId': strategy_id}
+
+    def _cancel_orders(self, symbol: str, order_ids: List[int]):
+        """Cancel placed splits, one batch request (and one token) per chunk"""
+        for i in range(0, len(order_ids), BATCH_CANCEL_MAX):
+            try:
+                _ORDER_BUCKET.acquire()
+                self.market_orders.cancel_orders(symbol, order_ids[i:i + BATCH_CANCEL_MAX])
+            except Exception as e:
+                logger.warning("Could not cancel orders: %s", e)
 
     def get_strategy_status(self, strategy_id: int) -> Dict[str, Any]:
         """
@@ -252,19 +729,21 @@ class TWAPStrategy:
         Returns:
             Strategy status
         """
-        for plan in self.order_history:
-            if plan['strategyId'] == strategy_id:
-                return plan
-
-        return {}
+        plan = self._by_id.get(strategy_id)
+        return plan.to_dict() if plan is not None else {}
 
     def get_all_strategies(self) -> List[Dict[str, Any]]:
         """Get all TWAP strategies"""
-        return self.order_history
+        with self._lock:
+            return [plan.to_dict() for plan in self.order_history]
+
+    def get_status_counts(self) -> Dict[str, int]:
+        """Get the number of TWAP strategies in each status"""
+        with self._lock:
+            return {status: n for status, n in self._status_counts.items() if n}
 
     def get_active_strategies(self) -> List[Dict[str, Any]]:
         """Get currently executing TWAP strategies"""
-        return [
-            plan for plan in self.order_history
-            if plan['status'] in ['PLANNED', 'EXECUTING']
-        ]
+        with self._lock:
+            # Strategy IDs are creation timestamps, so sorting keeps start order
+            return [self._by_id[i].to_dict() for i in sorted(self._active_ids)]
@@ -5,19 +5,97 @@ Handles API communication with proper error handling
 
 try:
     from binance.um_futures import UMFutures
+    from binance.error import ClientError, ServerError
     HAS_BINANCE_SDK = True
 except ImportError:
     HAS_BINANCE_SDK = False
 
+# The user data stream is optional; REST calls work without the websocket module
+try:
+    from binance.websocket.um_futures.websocket_client import UMFuturesWebsocketClient
+    HAS_WEBSOCKET = True
+except ImportError:
+    HAS_WEBSOCKET = False
+
 import sys
 import os
+import json
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.exceptions import MaxRetryError, NewConnectionError
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from config.config import API_KEY, API_SECRET, BASE_URL, HAS_API_CREDENTIALS
+from config.config import config
 from logger import get_logger
 
 logger = get_logger()
 
+# Binance caps on orders per batchOrders request
+BATCH_CREATE_MAX = 5
+BATCH_CANCEL_MAX = 10
+
+# Keep-alive connection pool shared by all calls on one client
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 64
+
+# User data stream endpoints; listen keys expire after 60 minutes without a keepalive
+STREAM_URL = 'wss://fstream.binance.com'
+TESTNET_STREAM_URL = 'wss://stream.binancefuture.com'
+LISTEN_KEY_KEEPALIVE = 30 * 60
+
+# Backoff bases (seconds) for retrying transient API failures
+RETRY_BACKOFF = 0.1
+RATE_LIMIT_BACKOFF = 1.0
+
+
+def _never_sent(error: Exception) -> bool:
+    """Whether a request failed before reaching the exchange (connection not established)"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    if isinstance(error, requests.ConnectionError) and error.args:
+        cause = error.args[0]
+        return isinstance(cause, MaxRetryError) and isinstance(cause.reason, NewConnectionError)
+    return False
+
+
+def retry_delay(error: Exception, attempt: int, idempotent: bool = True):
+    """
+    Backoff before retrying a failed API call
+    
+    Args:
+        error: Exception raised by the call
+        attempt: Zero-based number of the attempt that failed
+        idempotent: False for new-order requests. A read timeout, dropped
+            connection or 5xx may come after the exchange executed the order,
+            so those are only retried for calls that are safe to repeat
+        
+    Returns:
+        Seconds to wait, or None if the error should not be retried
+        (validation, rejected orders and other client errors)
+    """
+    if _never_sent(error):
+        return RETRY_BACKOFF * 2 ** attempt
+    
+    if HAS_BINANCE_SDK and isinstance(error, ClientError) and error.status_code == 429:
+        # Rate limited (the order was rejected): honour Retry-After when sent
+        retry_after = (error.header or {}).get('Retry-After')
+        if retry_after:
+            return float(retry_after)
+        return RATE_LIMIT_BACKOFF * 2 ** attempt
+    
+    if not idempotent:
+        return None
+    
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return RETRY_BACKOFF * 2 ** attempt
+    if HAS_BINANCE_SDK and isinstance(error, ServerError):
+        return RETRY_BACKOFF * 2 ** attempt
+    
+    return None
+
 
 class BinanceAPIClient:
     """Wrapper for Binance Futures API"""
@@ -32,29 +110,143 @@ class BinanceAPIClient:
         self.testnet = testnet
         self.client = None
         
+        # exchange_info() is a multi-MB payload; keep a symbol index for a while
+        self._symbols_cache: dict = {}
+        self._symbols_cache_ts = 0.0
+        self._symbols_cache_ttl = 300.0
+        self._symbols_lock = threading.Lock()
+        
+        # One user data stream per client, fanned out to every subscribed handler
+        self._order_listeners: list = []
+        self._user_stream = None
+        self._listen_key = None
+        self._keepalive = None
+        self._stream_lock = threading.Lock()
+        
         if not HAS_BINANCE_SDK:
             logger.warning("binance-connector not installed. Install with: pip install binance-connector")
             return
         
-        if not HAS_API_CREDENTIALS:
+        if not config.has_credentials:
             logger.warning("API credentials not configured. Using simulation mode only.")
             return
         
         try:
             self.client = UMFutures(
-                key=API_KEY,
-                secret=API_SECRET,
-                base_url=BASE_URL if not testnet else 'https://testnet.binancefuture.com',
+                key=config.api_key,
+                secret=config.api_secret,
+                base_url=config.base_url if not testnet else 'https://testnet.binancefuture.com',
                 timeout=10
             )
-            logger.info(f"Binance API client initialized ({'testnet' if testnet else 'mainnet'})")
+            
+            # Reuse TLS connections across orders. Retry only gateway errors;
+            # urllib3 never retries POST, so new orders are not resent
+            adapter = HTTPAdapter(
+                pool_connections=HTTP_POOL_CONNECTIONS,
+                pool_maxsize=HTTP_POOL_MAXSIZE,
+                max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504])
+            )
+            self.client.session.mount('https://', adapter)
+            self.client.session.headers['Connection'] = 'keep-alive'
+            logger.info("Binance API client initialized (%s)", 'testnet' if testnet else 'mainnet')
         except Exception as e:
-            logger.error(f"Failed to initialize Binance API client: {e}", exc_info=True)
+            logger.error("Failed to initialize Binance API client: %s", e, exc_info=True)
 
     def is_connected(self) -> bool:
         """Check if API client is properly connected"""
         return self.client is not None
 
+    def subscribe_order_updates(self, callback) -> bool:
+        """
+        Receive ORDER_TRADE_UPDATE events from the user data stream
+        
+        The websocket is opened on the first subscription and shared by all
+        later subscribers.
+        
+        Args:
+            callback: Called with the event's order payload ('o' field)
+            
+        Returns:
+            True if the stream is running
+        """
+        if not self.client:
+            return False
+        if not HAS_WEBSOCKET:
+            logger.warning("User data stream unavailable - websocket client not installed")
+            return False
+        
+        with self._stream_lock:
+            self._order_listeners.append(callback)
+            if self._user_stream is not None:
+                return True
+            
+            try:
+                self._listen_key = self.client.new_listen_key()['listenKey']
+                self._user_stream = UMFuturesWebsocketClient(
+                    stream_url=STREAM_URL if not self.testnet else TESTNET_STREAM_URL,
+                    on_message=self._on_user_message
+                )
+                self._user_stream.user_data(listen_key=self._listen_key)
+                self._schedule_keepalive()
+                logger.info("User data stream started")
+                return True
+            except Exception as e:
+                logger.error("Failed to start user data stream: %s", e, exc_info=True)
+                self._order_listeners.remove(callback)
+                self._user_stream = None
+                return False
+
+    def stop_user_stream(self):
+        """Close the user data stream and drop all subscribers"""
+        with self._stream_lock:
+            if self._user_stream is None:
+                return
+            
+            if self._keepalive:
+                self._keepalive.cancel()
+            self._user_stream.stop()
+            try:
+                self.client.close_listen_key(self._listen_key)
+            except Exception as e:
+                logger.warning("Failed to close listen key: %s", e)
+            
+            self._user_stream = None
+            self._listen_key = None
+            self._order_listeners.clear()
+            logger.info("User data stream stopped")
+
+    def _schedule_keepalive(self):
+        """Renew the listen key before it expires"""
+        self._keepalive = threading.Timer(LISTEN_KEY_KEEPALIVE, self._renew_listen_key)
+        self._keepalive.daemon = True
+        self._keepalive.start()
+
+    def _renew_listen_key(self):
+        try:
+            self.client.renew_listen_key(self._listen_key)
+        except Exception as e:
+            logger.error("Failed to renew listen key: %s", e)
+        
+        with self._stream_lock:
+            if self._user_stream is not None:
+                self._schedule_keepalive()
+
+    def _on_user_message(self, _, message):
+        """Dispatch order updates from the user data stream to subscribers"""
+        event = json.loads(message)
+        
+        if event.get('e') == 'listenKeyExpired':
+            logger.warning("User data stream listen key expired")
+            return
+        if event.get('e') != 'ORDER_TRADE_UPDATE':
+            return
+        
+        for callback in list(self._order_listeners):
+            try:
+                callback(event['o'])
+            except Exception as e:
+                logger.error("Order update handler failed: %s", e, exc_info=True)
+
     def futures_create_order(
         self,
         symbol: str,
@@ -102,7 +294,7 @@ class BinanceAPIClient:
             logger.log_api_response('futures/order', 200, response)
             return response
         except Exception as e:
-            logger.error(f"API error creating order: {e}", exc_info=True)
+            logger.error("API error creating order: %s", e, exc_info=True)
             raise
 
     def futures_cancel_order(self, symbol: str, orderId: int = None, origClientOrderId: str = None, **kwargs) -> dict:
@@ -139,7 +331,108 @@ class BinanceAPIClient:
             logger.log_api_response('futures/order', 200, response)
             return response
         except Exception as e:
-            logger.error(f"API error cancelling order: {e}", exc_info=True)
+            logger.error("API error cancelling order: %s", e, exc_info=True)
+            raise
+
+    def futures_modify_order(self, symbol: str, side: str, quantity: float, price: float,
+                             orderId: int = None, origClientOrderId: str = None, **kwargs) -> dict:
+        """
+        Amend the price/quantity of an open LIMIT order in place (PUT /fapi/v1/order)
+        
+        Args:
+            symbol: Trading pair
+            side: Original order side (required by the endpoint)
+            quantity: New order quantity
+            price: New limit price
+            orderId: Order ID to modify
+            origClientOrderId: Original client order ID
+            **kwargs: Additional parameters
+            
+        Returns:
+            Modified order response
+        """
+        if not self.client:
+            raise Exception("API client not initialized")
+        
+        params = {'symbol': symbol, 'side': side, 'quantity': quantity, 'price': price}
+        
+        if orderId:
+            params['orderId'] = orderId
+        elif origClientOrderId:
+            params['origClientOrderId'] = origClientOrderId
+        else:
+            raise ValueError("Either orderId or origClientOrderId must be provided")
+        
+        params.update(kwargs)
+        
+        logger.log_api_call('futures/order', 'PUT', params)
+        
+        try:
+            response = self.client.modify_order(**params)
+            logger.log_api_response('futures/order', 200, response)
+            return response
+        except Exception as e:
+            logger.error("API error modifying order: %s", e, exc_info=True)
+            raise
+
+    def futures_batch_create_orders(self, orders: list) -> list:
+        """
+        Create up to BATCH_CREATE_MAX futures orders in one request
+        
+        Args:
+            orders: List of order parameter dicts (symbol, side, type, ...)
+            
+        Returns:
+            List of per-order responses (failed entries carry code/msg)
+        """
+        if not self.client:
+            raise Exception("API client not initialized")
+        
+        if len(orders) > BATCH_CREATE_MAX:
+            raise ValueError(f"Batch cannot exceed {BATCH_CREATE_MAX} orders")
+        
+        logger.log_api_call('futures/batchOrders', 'POST', {'batchOrders': orders})
+        
+        try:
+            # The connector JSON-encodes the list when signing the request
+            response = self.client.new_batch_order(batchOrders=orders)
+            logger.log_api_response('futures/batchOrders', 200, response)
+            return response
+        except Exception as e:
+            logger.error("API error creating batch orders: %s", e, exc_info=True)
+            raise
+
+    def futures_batch_cancel_orders(self, symbol: str, orderIdList: list) -> list:
+        """
+        Cancel up to BATCH_CANCEL_MAX futures orders in one request
+        
+        Args:
+            symbol: Trading pair
+            orderIdList: Order IDs to cancel
+            
+        Returns:
+            List of per-order cancellation responses
+        """
+        if not self.client:
+            raise Exception("API client not initialized")
+        
+        if len(orderIdList) > BATCH_CANCEL_MAX:
+            raise ValueError(f"Batch cannot exceed {BATCH_CANCEL_MAX} orders")
+        
+        params = {'symbol': symbol, 'orderIdList': orderIdList}
+        
+        logger.log_api_call('futures/batchOrders', 'DELETE', params)
+        
+        try:
+            response = self.client.cancel_batch_order(
+                symbol=symbol,
+                orderIdList=orderIdList,
+                origClientOrderIdList=None
+            )
+            logger.log_api_response('futures/batchOrders', 200, response)
+            return response
+        except Exception as e:
+            logger.error("API error cancelling batch orders: %s", e, exc_info=True)
             raise
 
     def futures_get_order(self, symbol: str, orderId: int = None, origClientOrderId: str = None, **kwargs) -> dict:
@@ -176,7 +469,7 @@ class BinanceAPIClient:
             logger.log_api_response('futures/order', 200, response)
             return response
         except Exception as e:
-            logger.error(f"API error fetching order: {e}", exc_info=True)
+            logger.error("API error fetching order: %s", e, exc_info=True)
             raise
 
     def futures_get_open_orders(self, symbol: str = None, **kwargs) -> list:
@@ -205,7 +498,34 @@ class BinanceAPIClient:
             logger.log_api_response('futures/openOrders', 200, response)
             return response
         except Exception as e:
-            logger.error(f"API error fetching open orders: {e}", exc_info=True)
+            logger.error("API error fetching open orders: %s", e, exc_info=True)
+            raise
+
+    def futures_get_all_orders(self, symbol: str, **kwargs) -> list:
+        """
+        Get all orders (open, filled and cancelled) for a symbol
+        
+        Args:
+            symbol: Trading pair
+            **kwargs: Additional parameters (startTime, endTime, limit)
+            
+        Returns:
+            List of orders
+        """
+        if not self.client:
+            raise Exception("API client not initialized")
+        
+        params = {'symbol': symbol}
+        params.update(kwargs)
+        
+        logger.log_api_call('futures/allOrders', 'GET', params)
+        
+        try:
+            response = self.client.get_all_orders(**params)
+            logger.log_api_response('futures/allOrders', 200, response)
+            return response
+        except Exception as e:
+            logger.error("API error fetching order history: %s", e, exc_info=True)
             raise
 
     def futures_account(self) -> dict:
@@ -225,7 +545,7 @@ class BinanceAPIClient:
             logger.log_api_response('futures/account', 200, response)
             return response
         except Exception as e:
-            logger.error(f"API error fetching account: {e}", exc_info=True)
+            logger.error("API error fetching account: %s", e, exc_info=True)
             raise
 
     def get_symbol_info(self, symbol: str) -> dict:
@@ -241,21 +561,28 @@ class BinanceAPIClient:
         if not self.client:
             raise Exception("API client not initialized")
         
-        logger.debug(f"Fetching symbol info: {symbol}")
-        
         try:
-            response = self.client.exchange_info()
-            for s in response.get('symbols', []):
-                if s['symbol'] == symbol:
-                    return s
-            raise ValueError(f"Symbol {symbol} not found")
+            if time.monotonic() - self._symbols_cache_ts >= self._symbols_cache_ttl:
+                with self._symbols_lock:
+                    # Re-check so concurrent callers refetch only once
+                    if time.monotonic() - self._symbols_cache_ts >= self._symbols_cache_ttl:
+                        logger.debug("Fetching exchange info")
+                        response = self.client.exchange_info()
+                        self._symbols_cache = {s['symbol']: s for s in response.get('symbols', [])}
+                        self._symbols_cache_ts = time.monotonic()
+            
+            info = self._symbols_cache.get(symbol)
+            if info is None:
+                raise ValueError(f"Symbol {symbol} not found")
+            return info
         except Exception as e:
-            logger.error(f"API error fetching symbol info: {e}", exc_info=True)
+            logger.error("API error fetching symbol info: %s", e, exc_info=True)
             raise
 
 
 # Global API client instance
 _api_client = None
+_api_client_lock = threading.Lock()
 
 
 def get_api_client(testnet=False, force_new=False) -> BinanceAPIClient:
@@ -275,6 +602,9 @@ def get_api_client(testnet=False, force_new=False) -> BinanceAPIClient:
         return BinanceAPIClient(testnet=testnet)
     
     if _api_client is None:
-        _api_client = BinanceAPIClient(testnet=testnet)
+        with _api_client_lock:
+            # Re-check so concurrent first callers build only one client
+            if _api_client is None:
+                _api_client = BinanceAPIClient(testnet=testnet)
     
     return _api_client
@@ -6,69 +6,126 @@ Provides command-line interface for all order types and strategies
 import argparse
 import sys
 import json
+from collections import Counter, defaultdict
+from functools import cache
 from typing import Dict, Any
-from datetime import datetime
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 from logger import get_logger
-from api_client import get_api_client
-from market_orders import MarketOrder
-from limit_orders import LimitOrder
-from advanced.stop_limit import StopLimitOrder
-from advanced.oco import OCOOrder
-from advanced.twap import TWAPStrategy
-from advanced.grid import GridStrategy
 from validation import ValidationError
 
 logger = get_logger()
 
-# Initialize API client
-api_client = get_api_client()
+_SEP = "=" * 60
+
+# orjson flags matching json.dumps(indent=2) output
+_ORJSON_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) if HAS_ORJSON else 0
+
+# Order response layout; optional rows are only shown when present
+_ORDER_TEMPLATE = (
+    "\n{sep}\n"
+    "ORDER RESPONSE\n"
+    "{sep}\n"
+    "{idRows}"
+    "Symbol:          {symbol}\n"
+    "Side:            {side}\n"
+    "Type:            {type}\n"
+    "Status:          {status}\n"
+    "Quantity:        {quantity}\n"
+    "{extraRows}"
+    "{sep}"
+)
+_ORDER_ID_ROWS = (
+    ('orderId', "Order ID:        {}\n"),
+    ('orderListId', "Order List ID:   {}\n"),
+)
+_ORDER_EXTRA_ROWS = (
+    ('price', "Price:           {}\n"),
+    ('avgPrice', "Avg Price:       {}\n"),
+    ('executedQty', "Executed Qty:    {}\n"),
+)
+
+
+# The API client and order handlers are imported and built on first use, so
+# a command only pays for its own import graph (and --help for none of it)
+@cache
+def _get_client():
+    """API client wrapper passed to order handlers (None runs them in simulation)"""
+    from api_client import get_api_client
+    api_client = get_api_client()
+    # Handlers call the wrapper's futures_* methods, not the raw connector
+    return api_client if api_client.is_connected() else None
+
+
+@cache
+def _market_order():
+    from market_orders import MarketOrder
+    return MarketOrder(_get_client())
+
+
+@cache
+def _limit_order():
+    from limit_orders import LimitOrder
+    return LimitOrder(_get_client())
+
+
+@cache
+def _stop_limit_order():
+    from advanced.stop_limit import StopLimitOrder
+    return StopLimitOrder(_get_client())
+
+
+@cache
+def _oco_order():
+    from advanced.oco import OCOOrder
+    return OCOOrder(_get_client())
 
-# Initialize order handlers with API client
-market_order = MarketOrder(api_client.client if api_client.is_connected() else None)
-limit_order = LimitOrder(api_client.client if api_client.is_connected() else None)
-stop_limit_order = StopLimitOrder(api_client.client if api_client.is_connected() else None)
-oco_order = OCOOrder(api_client.client if api_client.is_connected() else None)
-twap_strategy = TWAPStrategy(api_client.client if api_client.is_connected() else None)
-grid_strategy = GridStrategy(api_client.client if api_client.is_connected() else None)
+
+@cache
+def _twap_strategy():
+    from advanced.twap import TWAPStrategy
+    return TWAPStrategy(_get_client())
+
+
+@cache
+def _grid_strategy():
+    from advanced.grid import GridStrategy
+    return GridStrategy(_get_client())
+
+
+def _to_json(data) -> str:
+    """Pretty-print data as JSON, using orjson when it is installed"""
+    if HAS_ORJSON:
+        return orjson.dumps(data, default=str, option=_ORJSON_OPTIONS).decode()
+    return json.dumps(data, indent=2, default=str)
 
 
 def format_order_response(order: Dict[str, Any]) -> str:
     """Format order response for display"""
-    output = []
-    output.append("\n" + "="*60)
-    output.append("ORDER RESPONSE")
-    output.append("="*60)
-    
-    if 'orderId' in order:
-        output.append(f"Order ID:        {order['orderId']}")
-    if 'orderListId' in order:
-        output.append(f"Order List ID:   {order['orderListId']}")
-    
-    output.append(f"Symbol:          {order.get('symbol', 'N/A')}")
-    output.append(f"Side:            {order.get('side', 'N/A')}")
-    output.append(f"Type:            {order.get('type', 'N/A')}")
-    output.append(f"Status:          {order.get('status', 'N/A')}")
-    output.append(f"Quantity:        {order.get('quantity', 0)}")
-    
-    if order.get('price'):
-        output.append(f"Price:           {order['price']}")
-    if order.get('avgPrice'):
-        output.append(f"Avg Price:       {order['avgPrice']}")
-    if order.get('executedQty'):
-        output.append(f"Executed Qty:    {order['executedQty']}")
-    
-    output.append("="*60)
-    return "\n".join(output)
+    fields = defaultdict(lambda: 'N/A', order)
+    fields['sep'] = _SEP
+    fields['quantity'] = order.get('quantity', 0)
+    fields['idRows'] = ''.join(
+        template.format(order[key]) for key, template in _ORDER_ID_ROWS if key in order
+    )
+    fields['extraRows'] = ''.join(
+        template.format(order[key]) for key, template in _ORDER_EXTRA_ROWS if order.get(key)
+    )
+    return _ORDER_TEMPLATE.format_map(fields)
 
 
 def cmd_market_order(args):
     """Handle market order command"""
     try:
-        mode = "TEST" if args.test or not api_client.is_connected() else "LIVE"
-        logger.info(f"Processing MARKET order ({mode}): {args.symbol} {args.side} {args.quantity}")
+        mode = "TEST" if args.test or _get_client() is None else "LIVE"
+        logger.info("Processing MARKET order (%s): %s %s %s", mode, args.symbol, args.side, args.quantity)
         
-        response = market_order.place_order(
+        response = _market_order().place_order(
             symbol=args.symbol,
             side=args.side,
             quantity=args.quantity,
@@ -79,11 +136,11 @@ def cmd_market_order(args):
         logger.info("Market order completed successfully")
         
     except ValidationError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         print(f"\n❌ Validation Error: {e}\n")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Market order failed: {e}", exc_info=True)
+        logger.error("Market order failed: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}\n")
         sys.exit(1)
 
@@ -92,11 +149,11 @@ def cmd_limit_order(args):
     """Handle limit order command"""
     try:
         logger.info(
-            f"Processing LIMIT order: {args.symbol} {args.side} "
-            f"{args.quantity} @ {args.price}"
+            "Processing LIMIT order: %s %s %s @ %s",
+            args.symbol, args.side, args.quantity, args.price
         )
         
-        response = limit_order.place_order(
+        response = _limit_order().place_order(
             symbol=args.symbol,
             side=args.side,
             quantity=args.quantity,
@@ -111,11 +168,11 @@ def cmd_limit_order(args):
         logger.info("Limit order completed successfully")
         
     except ValidationError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         print(f"\n❌ Validation Error: {e}\n")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Limit order failed: {e}", exc_info=True)
+        logger.error("Limit order failed: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}\n")
         sys.exit(1)
 
@@ -124,11 +181,11 @@ def cmd_stop_limit_order(args):
     """Handle stop-limit order command"""
     try:
         logger.info(
-            f"Processing STOP-LIMIT order: {args.symbol} {args.side} "
-            f"{args.quantity} | Stop: {args.stop_price} | Limit: {args.limit_price}"
+            "Processing STOP-LIMIT order: %s %s %s | Stop: %s | Limit: %s",
+            args.symbol, args.side, args.quantity, args.stop_price, args.limit_price
         )
         
-        response = stop_limit_order.place_order(
+        response = _stop_limit_order().place_order(
             symbol=args.symbol,
             side=args.side,
             quantity=args.quantity,
@@ -142,11 +199,11 @@ def cmd_stop_limit_order(args):
         logger.info("Stop-limit order completed successfully")
         
     except ValidationError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         print(f"\n❌ Validation Error: {e}\n")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Stop-limit order failed: {e}", exc_info=True)
+        logger.error("Stop-limit order failed: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}\n")
         sys.exit(1)
 
@@ -155,11 +212,11 @@ def cmd_oco_order(args):
     """Handle OCO order command"""
     try:
         logger.info(
-            f"Processing OCO order: {args.symbol} {args.side} {args.quantity} | "
-            f"TP: {args.take_profit} | SL: {args.stop_loss}"
+            "Processing OCO order: %s %s %s | TP: %s | SL: %s",
+            args.symbol, args.side, args.quantity, args.take_profit, args.stop_loss
         )
         
-        response = oco_order.place_order(
+        response = _oco_order().place_order(
             symbol=args.symbol,
             side=args.side,
             quantity=args.quantity,
@@ -173,24 +230,33 @@ def cmd_oco_order(args):
         logger.info("OCO order completed successfully")
         
     except ValidationError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         print(f"\n❌ Validation Error: {e}\n")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"OCO order failed: {e}", exc_info=True)
+        logger.error("OCO order failed: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}\n")
         sys.exit(1)
 
 
 def cmd_twap_order(args):
     """Handle TWAP strategy command"""
+    streaming = False
     try:
         logger.info(
-            f"Processing TWAP strategy: {args.symbol} {args.side} "
-            f"{args.quantity} | Splits: {args.splits} | Interval: {args.interval}s"
+            "Processing TWAP strategy: %s %s %s | Splits: %s | Interval: %ss",
+            args.symbol, args.side, args.quantity, args.splits, args.interval
+        )
+        
+        twap = _twap_strategy()
+        # Limit splits pick up fills from the user data stream while the run is
+        # live; it is opened first so no split's updates are missed
+        streaming = (
+            not args.test and args.order_type == 'LIMIT'
+            and twap.limit_orders.start_user_stream()
         )
         
-        response = twap_strategy.place_order(
+        response = twap.place_order(
             symbol=args.symbol,
             side=args.side,
             total_quantity=args.quantity,
@@ -202,9 +268,9 @@ def cmd_twap_order(args):
         )
         
         output = []
-        output.append("\n" + "="*60)
+        output.append("\n" + _SEP)
         output.append("TWAP STRATEGY INITIATED")
-        output.append("="*60)
+        output.append(_SEP)
         output.append(f"Strategy ID:     {response['strategyId']}")
         output.append(f"Symbol:          {response['symbol']}")
         output.append(f"Side:            {response['side']}")
@@ -214,64 +280,87 @@ def cmd_twap_order(args):
         output.append(f"Interval:        {response['interval']}s")
         output.append(f"Order Type:      {response['orderType']}")
         output.append(f"Status:          {response['status']}")
-        output.append("="*60 + "\n")
+        output.append(_SEP + "\n")
         print("\n".join(output))
         
-        logger.info(f"TWAP strategy {response['strategyId']} initiated")
+        logger.info("TWAP strategy %s initiated", response['strategyId'])
+        
+        # Splits are sent in the background; stay alive until they are done
+        if not args.test:
+            twap.wait(response['strategyId'])
+
+            if streaming:
+                # The split orders are the ones the stream updated, so this shows fills,
+                # not the NEW status they were placed with
+                splits = Counter(
+                    order.get('status') for order
+                    in twap.get_strategy_status(response['strategyId'])['orders']
+                )
+                print("Split orders:    " + " | ".join(
+                    f"{status} {count}" for status, count in sorted(splits.items())
+                ) + "\n")
         
     except ValidationError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         print(f"\n❌ Validation Error: {e}\n")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"TWAP strategy failed: {e}", exc_info=True)
+        logger.error("TWAP strategy failed: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}\n")
         sys.exit(1)
+    finally:
+        if streaming:
+            _get_client().stop_user_stream()
 
 
 def cmd_grid_order(args):
     """Handle Grid strategy command"""
     try:
         logger.info(
-            f"Processing GRID strategy: {args.symbol} {args.grid_type} "
-            f"Range: {args.lower}-{args.upper} | Grids: {args.grids}"
+            "Processing GRID strategy: %s %s Range: %s-%s | Grids: %s",
+            args.symbol, args.grid_type, args.lower, args.upper, args.grids
         )
         
-        response = grid_strategy.place_order(
+        response = _grid_strategy().place_order(
             symbol=args.symbol,
             lower_price=args.lower,
             upper_price=args.upper,
             num_grids=args.grids,
             total_quantity=args.quantity,
             grid_type=args.grid_type,
-            test_mode=args.test
+            test_mode=args.test,
+            spacing=args.spacing
         )
         
         output = []
-        output.append("\n" + "="*60)
+        output.append("\n" + _SEP)
         output.append("GRID STRATEGY INITIATED")
-        output.append("="*60)
+        output.append(_SEP)
         output.append(f"Strategy ID:     {response['strategyId']}")
         output.append(f"Symbol:          {response['symbol']}")
         output.append(f"Grid Type:       {response['gridType']}")
         output.append(f"Price Range:     {response['lowerPrice']} - {response['upperPrice']}")
         output.append(f"Number of Grids: {response['numGrids']}")
-        output.append(f"Price Step:      {response['priceStep']:.8f}")
+        output.append(f"Spacing:         {response['spacing']}")
+        if 'ratio' in response:
+            output.append(f"Price Ratio:     {response['ratio']:.8f}")
+        else:
+            output.append(f"Price Step:      {response['priceStep']:.8f}")
         output.append(f"Total Qty:       {response['totalQuantity']}")
         output.append(f"Qty Per Grid:    {response['quantityPerGrid']}")
         output.append(f"Status:          {response['status']}")
         output.append(f"Orders Placed:   {len(response['orders'])}")
-        output.append("="*60 + "\n")
+        output.append(_SEP + "\n")
         print("\n".join(output))
         
-        logger.info(f"Grid strategy {response['strategyId']} initiated")
+        logger.info("Grid strategy %s initiated", response['strategyId'])
         
     except ValidationError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
         print(f"\n❌ Validation Error: {e}\n")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Grid strategy failed: {e}", exc_info=True)
+        logger.error("Grid strategy failed: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}\n")
         sys.exit(1)
 
@@ -280,26 +369,26 @@ def cmd_status(args):
     """Check order/strategy status"""
     try:
         if args.type == 'market':
-            status = market_order.get_order_status(args.order_id)
+            status = _market_order().get_order_status(args.order_id)
         elif args.type == 'limit':
-            status = limit_order.get_order_status(args.symbol, args.order_id)
+            status = _limit_order().get_order_status(args.symbol, args.order_id)
         elif args.type == 'stop_limit':
-            status = stop_limit_order.get_order_status(args.symbol, args.order_id)
+            status = _stop_limit_order().get_order_status(args.symbol, args.order_id)
         elif args.type == 'twap':
-            status = twap_strategy.get_strategy_status(args.order_id)
+            status = _twap_strategy().get_strategy_status(args.order_id)
         elif args.type == 'grid':
-            status = grid_strategy.get_strategy_status(args.order_id)
+            status = _grid_strategy().get_strategy_status(args.order_id)
         else:
             raise ValueError(f"Unknown type: {args.type}")
         
-        print("\n" + "="*60)
+        print("\n" + _SEP)
         print("ORDER/STRATEGY STATUS")
-        print("="*60)
-        print(json.dumps(status, indent=2))
-        print("="*60 + "\n")
+        print(_SEP)
+        print(_to_json(status))
+        print(_SEP + "\n")
         
     except Exception as e:
-        logger.error(f"Status check failed: {e}", exc_info=True)
+        logger.error("Status check failed: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}\n")
         sys.exit(1)
 
@@ -308,58 +397,33 @@ def cmd_history(args):
     """View order/strategy history"""
     try:
         if args.type == 'market':
-            history = market_order.get_order_history()
+            history = _market_order().get_order_history()
         elif args.type == 'limit':
-            history = limit_order.get_order_history()
+            if args.symbols and _get_client() is not None:
+                history = _limit_order().get_order_history_bulk(args.symbols)
+            else:
+                history = _limit_order().get_order_history()
         elif args.type == 'twap':
-            history = twap_strategy.get_all_strategies()
+            history = _twap_strategy().get_all_strategies()
         elif args.type == 'grid':
-            history = grid_strategy.get_all_strategies()
+            history = _grid_strategy().get_all_strategies()
         else:
             raise ValueError(f"Unknown type: {args.type}")
         
-        print("\n" + "="*60)
+        print("\n" + _SEP)
         print(f"{args.type.upper()} ORDER/STRATEGY HISTORY")
-        print("="*60)
-        print(json.dumps(history, indent=2, default=str))
-        print("="*60 + "\n")
+        print(_SEP)
+        print(_to_json(history))
+        print(_SEP + "\n")
         
     except Exception as e:
-        logger.error(f"History retrieval failed: {e}", exc_info=True)
+        logger.error("History retrieval failed: %s", e, exc_info=True)
         print(f"\n❌ Error: {e}\n")
         sys.exit(1)
 
 
-def main():
-    """Main CLI entry point"""
-    parser = argparse.ArgumentParser(
-        description='Binance Futures Trading Bot',
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
-EXAMPLES:
-  # Market order
-  python bot.py market BTCUSDT BUY 0.01
-
-  # Limit order
-  python bot.py limit ETHUSDT BUY 1.0 2300.50
-
-  # Stop-limit order
-  python bot.py stop-limit BTCUSDT SELL 0.01 42000 41500
-
-  # OCO order (take-profit + stop-loss)
-  python bot.py oco BTCUSDT BUY 0.01 45000 40000
-
-  # TWAP strategy (split 0.05 BTC into 5 orders over 30 seconds)
-  python bot.py twap BTCUSDT BUY 0.05 --splits 5 --interval 10
-
-  # Grid strategy (buy-low/sell-high between 40000-45000)
-  python bot.py grid BTCUSDT 40000 45000 --grids 10 --qty 0.1 --type LONG
-        """
-    )
-
-    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
-
-    # Market order command
+def _add_market_parser(subparsers):
+    """Market order command"""
     market_parser = subparsers.add_parser('market', help='Place a market order')
     market_parser.add_argument('symbol', help='Trading pair (e.g., BTCUSDT)')
     market_parser.add_argument('side', help='BUY or SELL')
@@ -367,7 +431,9 @@ EXAMPLES:
     market_parser.add_argument('--test', action='store_true', help='Test mode (simulated)')
     market_parser.set_defaults(func=cmd_market_order)
 
-    # Limit order command
+
+def _add_limit_parser(subparsers):
+    """Limit order command"""
     limit_parser = subparsers.add_parser('limit', help='Place a limit order')
     limit_parser.add_argument('symbol', help='Trading pair')
     limit_parser.add_argument('side', help='BUY or SELL')
@@ -380,7 +446,9 @@ EXAMPLES:
     limit_parser.add_argument('--test', action='store_true', help='Test mode')
     limit_parser.set_defaults(func=cmd_limit_order)
 
-    # Stop-limit order command
+
+def _add_stop_limit_parser(subparsers):
+    """Stop-limit order command"""
     sl_parser = subparsers.add_parser('stop-limit', help='Place a stop-limit order')
     sl_parser.add_argument('symbol', help='Trading pair')
     sl_parser.add_argument('side', help='BUY or SELL')
@@ -392,7 +460,9 @@ EXAMPLES:
     sl_parser.add_argument('--test', action='store_true', help='Test mode')
     sl_parser.set_defaults(func=cmd_stop_limit_order)
 
-    # OCO order command
+
+def _add_oco_parser(subparsers):
+    """OCO order command"""
     oco_parser = subparsers.add_parser('oco', help='Place an OCO order')
     oco_parser.add_argument('symbol', help='Trading pair')
     oco_parser.add_argument('side', help='BUY or SELL')
@@ -404,20 +474,24 @@ EXAMPLES:
     oco_parser.add_argument('--test', action='store_true', help='Test mode')
     oco_parser.set_defaults(func=cmd_oco_order)
 
-    # TWAP strategy command
+
+def _add_twap_parser(subparsers):
+    """TWAP strategy command"""
     twap_parser = subparsers.add_parser('twap', help='Execute TWAP strategy')
     twap_parser.add_argument('symbol', help='Trading pair')
     twap_parser.add_argument('side', help='BUY or SELL')
     twap_parser.add_argument('quantity', type=float, help='Total quantity')
     twap_parser.add_argument('--splits', type=int, default=5, help='Number of splits')
-    twap_parser.add_argument('--interval', type=int, default=10, help='Interval in seconds')
+    twap_parser.add_argument('--interval', type=int, default=10, help='Interval in seconds (0 = all splits at once)')
     twap_parser.add_argument('--order-type', default='MARKET',
                              choices=['MARKET', 'LIMIT'], help='Order type')
     twap_parser.add_argument('--price', type=float, help='Limit price (if LIMIT)')
     twap_parser.add_argument('--test', action='store_true', help='Test mode')
     twap_parser.set_defaults(func=cmd_twap_order)
 
-    # Grid strategy command
+
+def _add_grid_parser(subparsers):
+    """Grid strategy command"""
     grid_parser = subparsers.add_parser('grid', help='Execute grid strategy')
     grid_parser.add_argument('symbol', help='Trading pair')
     grid_parser.add_argument('lower', type=float, help='Lower price bound')
@@ -427,21 +501,95 @@ EXAMPLES:
                              help='Total quantity')
     grid_parser.add_argument('--type', dest='grid_type', default='LONG',
                              choices=['LONG', 'SHORT'], help='Grid type')
+    grid_parser.add_argument('--spacing', default='arithmetic',
+                             choices=['arithmetic', 'geometric'], help='Grid level spacing')
     grid_parser.add_argument('--test', action='store_true', help='Test mode')
     grid_parser.set_defaults(func=cmd_grid_order)
 
-    # Status command
+
+def _add_status_parser(subparsers):
+    """Status command"""
     status_parser = subparsers.add_parser('status', help='Check order/strategy status')
     status_parser.add_argument('type', choices=['market', 'limit', 'stop_limit', 'twap', 'grid'])
     status_parser.add_argument('order_id', type=int, help='Order or strategy ID')
     status_parser.add_argument('--symbol', help='Trading pair (for limit/stop-limit)')
     status_parser.set_defaults(func=cmd_status)
 
-    # History command
+
+def _add_history_parser(subparsers):
+    """History command"""
     history_parser = subparsers.add_parser('history', help='View order/strategy history')
     history_parser.add_argument('type', choices=['market', 'limit', 'twap', 'grid'])
+    history_parser.add_argument('--symbols', nargs='+',
+                                help='Fetch limit order history from the exchange for these pairs')
     history_parser.set_defaults(func=cmd_history)
 
+
+# Subparser builders keyed by command name
+COMMANDS = {
+    'market': _add_market_parser,
+    'limit': _add_limit_parser,
+    'stop-limit': _add_stop_limit_parser,
+    'oco': _add_oco_parser,
+    'twap': _add_twap_parser,
+    'grid': _add_grid_parser,
+    'status': _add_status_parser,
+    'history': _add_history_parser,
+}
+
+
+def build_parser(command: str = None) -> argparse.ArgumentParser:
+    """
+    Build the CLI argument parser
+    
+    Args:
+        command: Only add this command's subparser (all commands if None or unknown)
+        
+    Returns:
+        Argument parser
+    """
+    parser = argparse.ArgumentParser(
+        description='Binance Futures Trading Bot',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+EXAMPLES:
+  # Market order
+  python bot.py market BTCUSDT BUY 0.01
+
+  # Limit order
+  python bot.py limit ETHUSDT BUY 1.0 2300.50
+
+  # Stop-limit order
+  python bot.py stop-limit BTCUSDT SELL 0.01 42000 41500
+
+  # OCO order (take-profit + stop-loss)
+  python bot.py oco BTCUSDT BUY 0.01 45000 40000
+
+  # TWAP strategy (split 0.05 BTC into 5 orders over 30 seconds)
+  python bot.py twap BTCUSDT BUY 0.05 --splits 5 --interval 10
+
+  # Grid strategy (buy-low/sell-high between 40000-45000)
+  python bot.py grid BTCUSDT 40000 45000 --grids 10 --qty 0.1 --type LONG
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command', help='Command to execute')
+
+    if command in COMMANDS:
+        COMMANDS[command](subparsers)
+    else:
+        for add_parser in COMMANDS.values():
+            add_parser(subparsers)
+
+    return parser
+
+
+def main():
+    """Main CLI entry point"""
+    # Only the requested command's subparser is built; --help, no command or
+    # an unknown command falls back to the full parser
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+    parser = build_parser(command)
     args = parser.parse_args()
 
     if not args.command:
@@ -451,7 +599,7 @@ EXAMPLES:
     try:
         args.func(args)
     except Exception as e:
-        logger.critical(f"Unexpected error: {e}", exc_info=True)
+        logger.critical("Unexpected error: %s", e, exc_info=True)
         print(f"\n❌ Critical Error: {e}\n")
         sys.exit(1)
 
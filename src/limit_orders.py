@@ -3,13 +3,20 @@ Limit Order implementation for Binance Futures Trading Bot
 Executes orders at specified price or better
 """
 
-from typing import Dict, Any, Optional
-from datetime import datetime
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Set
+from time import time_ns
 from validation import validate_limit_order, ValidationError
 from logger import get_logger
+from api_client import BATCH_CREATE_MAX
 
 logger = get_logger()
 
+# Concurrent per-symbol requests when pulling order history from the exchange
+HISTORY_WORKERS = 10
+
 
 class LimitOrder:
     """Limit order handler - executes at specified price or better"""
@@ -22,7 +29,16 @@ class LimitOrder:
             api_client: Binance API client (for actual trading)
         """
         self.api_client = api_client
-        self.order_history = []
+        self.order_history: List[Dict[str, Any]] = []
+        # Positions in order_history by status and symbol, so open-order
+        # lookups only touch the matching orders, and the latest position
+        # of each order ID (simulated orders all share one ID)
+        self._by_status: Dict[str, Set[int]] = defaultdict(set)
+        self._by_symbol: Dict[str, Set[int]] = defaultdict(set)
+        self._by_order_id: Dict[int, int] = {}
+        # Guards the history and indexes: TWAP splits record from worker
+        # threads and user stream updates arrive on the websocket thread
+        self._lock = threading.RLock()
 
     def place_order(
         self,
@@ -59,7 +75,7 @@ class LimitOrder:
         try:
             validated = validate_limit_order(symbol, side, quantity, price)
         except ValidationError as e:
-            logger.error(f"Limit order validation failed: {e}")
+            logger.error("Limit order validation failed: %s", e)
             raise
 
         symbol = validated['symbol']
@@ -115,17 +131,17 @@ class LimitOrder:
             'price': price,
             'executedQty': 0,
             'status': 'NEW',
-            'updateTime': int(datetime.now().timestamp() * 1000),
+            'updateTime': time_ns() // 1_000_000,
             'avgPrice': 0,
             'totalFill': 0
         }
 
         logger.info(
-            f"Simulated LIMIT order placed: {symbol} {side} {quantity} @ {price} | "
-            f"Order ID: {response['orderId']} | Status: {response['status']}"
+            "Simulated LIMIT order placed: %s %s %s @ %s | Order ID: %s | Status: %s",
+            symbol, side, quantity, price, response['orderId'], response['status']
         )
 
-        self.order_history.append(response)
+        self._record(response)
         return response
 
     def _place_via_api(
@@ -156,9 +172,6 @@ class LimitOrder:
         Raises:
             Exception: If API call fails
         """
-        if not self.api_client:
-            raise Exception("API client not configured")
-
         try:
             params = {
                 'symbol': symbol,
@@ -180,17 +193,141 @@ class LimitOrder:
 
             logger.log_api_response('futures/order', 200, response)
             logger.info(
-                f"LIMIT order placed: {symbol} {side} {quantity} @ {price} | "
-                f"Order ID: {response['orderId']} | Status: {response['status']}"
+                "LIMIT order placed: %s %s %s @ %s | Order ID: %s | Status: %s",
+                symbol, side, quantity, price, response['orderId'], response['status']
             )
 
-            self.order_history.append(response)
+            self._record(response)
             return response
 
         except Exception as e:
-            logger.error(f"API error placing limit order: {e}", exc_info=True)
+            logger.error("API error placing limit order: %s", e, exc_info=True)
+            raise
+
+    def place_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Place up to BATCH_CREATE_MAX limit orders in one batch request.
+        
+        Args:
+            batch: Order dicts with symbol, side, quantity, price and
+                optionally time_in_force, post_only, reduce_only
+            
+        Returns:
+            Responses in the same order as the batch; rejected orders are
+            returned as dicts carrying the exchange's code and msg
+            
+        Raises:
+            ValidationError: If any order is invalid (nothing is sent)
+            Exception: If the API call fails
+        """
+        if len(batch) > BATCH_CREATE_MAX:
+            raise ValidationError(f"Batch cannot exceed {BATCH_CREATE_MAX} orders")
+
+        validated = []
+        for order in batch:
+            try:
+                v = validate_limit_order(
+                    order['symbol'], order['side'], order['quantity'], order['price']
+                )
+            except ValidationError as e:
+                logger.error("Limit order validation failed: %s", e)
+                raise
+            v['time_in_force'] = order.get('time_in_force', 'GTC')
+            v['post_only'] = order.get('post_only', False)
+            v['reduce_only'] = order.get('reduce_only', False)
+            validated.append(v)
+
+        if self.api_client is None:
+            return [
+                self._simulate_limit_order(
+                    v['symbol'], v['side'], v['quantity'], v['price'], v['time_in_force']
+                )
+                for v in validated
+            ]
+
+        # The batch endpoint takes every value as a string
+        batch_params = []
+        for v in validated:
+            params = {
+                'symbol': v['symbol'],
+                'side': v['side'],
+                'type': 'LIMIT',
+                'timeInForce': v['time_in_force'],
+                'quantity': str(v['quantity']),
+                'price': str(v['price'])
+            }
+            if v['post_only']:
+                params['postOnly'] = 'true'
+            if v['reduce_only']:
+                params['reduceOnly'] = 'true'
+            batch_params.append(params)
+
+        try:
+            responses = self.api_client.futures_batch_create_orders(batch_params)
+        except Exception as e:
+            logger.error("API error placing limit order batch: %s", e, exc_info=True)
             raise
 
+        # Each position in the response matches the order sent at that position
+        for v, response in zip(validated, responses):
+            if 'code' in response:
+                logger.error(
+                    "LIMIT order rejected: %s %s %s @ %s | %s",
+                    v['symbol'], v['side'], v['quantity'], v['price'], response.get('msg')
+                )
+                continue
+            logger.info(
+                "LIMIT order placed: %s %s %s @ %s | Order ID: %s | Status: %s",
+                v['symbol'], v['side'], v['quantity'], v['price'],
+                response['orderId'], response['status']
+            )
+            self._record(response)
+
+        return responses
+
+    def _record(self, order: Dict[str, Any]):
+        """Append an order to the history and index it by status and symbol"""
+        with self._lock:
+            position = len(self.order_history)
+            self.order_history.append(order)
+            self._by_order_id[order['orderId']] = position
+            self._by_status[order.get('status')].add(position)
+            self._by_symbol[order.get('symbol')].add(position)
+
+    def _update(self, order_id: int, fields: Dict[str, Any]):
+        """Merge new fields into a tracked order, keeping its status index current"""
+        with self._lock:
+            position = self._by_order_id.get(order_id)
+            if position is None:
+                return
+            order = self.order_history[position]
+            self._by_status[order.get('status')].discard(position)
+            order.update(fields)
+            self._by_status[order.get('status')].add(position)
+
+    def start_user_stream(self) -> bool:
+        """
+        Keep tracked orders current from the user data stream.
+        
+        Once running, fills and cancels are pushed into the order index, so
+        get_order_status answers tracked orders without polling the API.
+        
+        Returns:
+            True if the stream is running
+        """
+        if self.api_client is None:
+            return False
+        return self.api_client.subscribe_order_updates(self._on_order_update)
+
+    def _on_order_update(self, update: Dict[str, Any]):
+        """Apply an ORDER_TRADE_UPDATE payload to the matching tracked order"""
+        self._update(update['i'], {
+            'status': update['X'],
+            'executedQty': update['z'],
+            'avgPrice': update['ap'],
+            'updateTime': update['T']
+        })
+
     def modify_order(
         self,
         symbol: str,
@@ -211,24 +348,43 @@ class LimitOrder:
             Updated order response
         """
         if not self.api_client:
-            logger.warning(f"Cannot modify order {order_id} - no API client")
+            logger.warning("Cannot modify order %s - no API client", order_id)
             return {'status': 'MODIFIED', 'note': 'Simulated modification'}
 
         try:
-            # Cancel original order
-            logger.info(f"Cancelling original order {order_id} to modify")
-            self.cancel_order(symbol, order_id)
+            # The amend endpoint needs side, quantity and price, so fill the
+            # unchanged fields from the tracked (or fetched) original order
+            original = self.get_order_status(symbol, order_id)
+            if not original:
+                raise ValidationError(f"Order {order_id} not found - cannot modify")
+
+            validated = validate_limit_order(
+                symbol,
+                original['side'],
+                new_quantity or float(original.get('origQty', original.get('quantity'))),
+                new_price or float(original['price'])
+            )
 
-            # Place new order with updated parameters
-            return self.place_order(
-                symbol=symbol,
-                side='BUY',  # This would need to be tracked from original
-                quantity=new_quantity or 1.0,
-                price=new_price or 0.0
+            # Amend in place: one round trip and the order never leaves the book
+            logger.info("Modifying order %s: %s @ %s", order_id, validated['quantity'], validated['price'])
+            response = self.api_client.futures_modify_order(
+                symbol=validated['symbol'],
+                side=validated['side'],
+                quantity=validated['quantity'],
+                price=validated['price'],
+                orderId=order_id
             )
 
+            # An amended order keeps its ID, so update it rather than add a new entry
+            with self._lock:
+                if order_id in self._by_order_id:
+                    self._update(order_id, response)
+                else:
+                    self._record(response)
+            return response
+
         except Exception as e:
-            logger.error(f"Error modifying order {order_id}: {e}", exc_info=True)
+            logger.error("Error modifying order %s: %s", order_id, e, exc_info=True)
             raise
 
     def get_order_status(self, symbol: str, order_id: int) -> Dict[str, Any]:
@@ -243,10 +399,12 @@ class LimitOrder:
             Order status dictionary
         """
         # Check history first
-        for order in self.order_history:
-            if order.get('orderId') == order_id:
-                logger.info(f"Order {order_id} found in history: {order['status']}")
-                return order
+        with self._lock:
+            position = self._by_order_id.get(order_id)
+            order = self.order_history[position] if position is not None else None
+        if order is not None:
+            logger.info("Order %s found in history: %s", order_id, order['status'])
+            return order
 
         # Query via API if not in history
         if self.api_client:
@@ -259,10 +417,10 @@ class LimitOrder:
                 logger.log_api_response('futures/order', 200, response)
                 return response
             except Exception as e:
-                logger.error(f"Error fetching order {order_id}: {e}", exc_info=True)
+                logger.error("Error fetching order %s: %s", order_id, e, exc_info=True)
                 raise
 
-        logger.warning(f"Order {order_id} not found")
+        logger.warning("Order %s not found", order_id)
         return {}
 
     def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
@@ -277,7 +435,8 @@ class LimitOrder:
             Cancellation response
         """
         if not self.api_client:
-            logger.warning(f"Cannot cancel order {order_id} - no API client")
+            logger.warning("Cannot cancel order %s - no API client", order_id)
+            self._update(order_id, {'status': 'CANCELLED'})
             return {'status': 'CANCELLED', 'note': 'Simulated cancellation'}
 
         try:
@@ -292,11 +451,12 @@ class LimitOrder:
             )
 
             logger.log_api_response('futures/order', 200, response)
-            logger.info(f"Order {order_id} cancelled successfully")
+            logger.info("Order %s cancelled successfully", order_id)
+            self._update(order_id, {'status': response.get('status', 'CANCELLED')})
             return response
 
         except Exception as e:
-            logger.error(f"Error cancelling order {order_id}: {e}", exc_info=True)
+            logger.error("Error cancelling order %s: %s", order_id, e, exc_info=True)
             raise
 
     def get_open_orders(self, symbol: Optional[str] = None) -> list:
@@ -309,19 +469,50 @@ class LimitOrder:
         Returns:
             List of open orders
         """
-        open_orders = [
-            order for order in self.order_history
-            if order.get('status') == 'NEW'
-        ]
-
-        if symbol:
-            open_orders = [
-                order for order in open_orders
-                if order.get('symbol') == symbol
-            ]
+        with self._lock:
+            positions = self._by_status['NEW']
+            if symbol:
+                positions = positions & self._by_symbol[symbol]
 
-        return open_orders
+            # Sorted history positions are placement order
+            return [self.order_history[position] for position in sorted(positions)]
 
     def get_order_history(self) -> list:
         """Get all orders placed in this session"""
-        return self.order_history
+        with self._lock:
+            return list(self.order_history)
+
+    def get_order_history_bulk(self, symbols: Optional[List[str]] = None) -> list:
+        """
+        Fetch LIMIT order history from the exchange for several symbols.
+        
+        Args:
+            symbols: Trading pairs to query (defaults to symbols traded this session)
+            
+        Returns:
+            Orders from all symbols, oldest first
+        """
+        if not self.api_client:
+            logger.warning("Cannot fetch exchange order history - no API client")
+            return self.get_order_history()
+
+        if symbols is None:
+            with self._lock:
+                symbols = list(self._by_symbol)
+        if not symbols:
+            return []
+
+        # One allOrders request per symbol, issued concurrently over the pooled session
+        workers = min(len(symbols), HISTORY_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda symbol: self.api_client.futures_get_all_orders(symbol=symbol),
+                symbols
+            )
+            orders = [
+                order for result in results for order in result
+                if order.get('type') == 'LIMIT'
+            ]
+
+        orders.sort(key=lambda order: order.get('updateTime', 0))
+        return orders
@@ -3,12 +3,28 @@ Structured logging module for Binance Futures Trading Bot
 Provides centralized logging with timestamps and error tracing
 """
 
+import atexit
 import logging
 import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 from pathlib import Path
 
 
+# Lowest level recorded, from the LOG_LEVEL environment variable. At INFO
+# or above, debug-only formatting (e.g. API response summaries) is skipped.
+DEFAULT_LOG_LEVEL = 'DEBUG'
+
+# log_execution formats keyed by (has fill price, has filled quantity)
+_EXECUTION_FORMATS = {
+    (False, False): "ORDER EXECUTION: ID=%s | Status=%s",
+    (True, False): "ORDER EXECUTION: ID=%s | Status=%s | Fill Price: %s",
+    (False, True): "ORDER EXECUTION: ID=%s | Status=%s | Qty Filled: %s",
+    (True, True): "ORDER EXECUTION: ID=%s | Status=%s | Fill Price: %s | Qty Filled: %s",
+}
+
+
 class BotLogger:
     """Centralized logger for the trading bot"""
 
@@ -16,10 +32,23 @@ class BotLogger:
         self.log_file = log_file
         self.logger = self._setup_logger()
 
+        # Level methods are the stdlib logger's own bound methods, so a call
+        # costs no wrapper frame and records carry the real caller's
+        # funcName/lineno. Messages accept %-style args, formatted only if
+        # the record is emitted.
+        self.debug = self.logger.debug
+        self.info = self.logger.info
+        self.warning = self.logger.warning
+        self.error = self.logger.error
+        self.critical = self.logger.critical
+        self.isEnabledFor = self.logger.isEnabledFor
+
     def _setup_logger(self):
         """Configure logger with file and console handlers"""
         logger = logging.getLogger("BinanceFuturesBot")
-        logger.setLevel(logging.DEBUG)
+        level = (os.environ.get('LOG_LEVEL') or DEFAULT_LOG_LEVEL).upper()
+        invalid_level = not isinstance(logging.getLevelName(level), int)
+        logger.setLevel(DEFAULT_LOG_LEVEL if invalid_level else level)
 
         # Ensure log file exists and has secure permissions (0600) before opening
         # Use os.open to securely create the file and avoid TOCTOU vulnerabilities
@@ -49,64 +78,60 @@ class BotLogger:
         file_handler.setFormatter(file_formatter)
         console_handler.setFormatter(console_formatter)
 
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-
-        return logger
-
-    def info(self, message):
-        """Log info level message"""
-        self.logger.info(message)
-
-    def error(self, message, exc_info=False):
-        """Log error level message with optional traceback"""
-        self.logger.error(message, exc_info=exc_info)
+        # Handlers run on a background listener thread; callers only enqueue
+        log_queue = queue.Queue(-1)
+        self.listener = QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        # Drain pending records before the interpreter exits
+        atexit.register(self.listener.stop)
 
-    def warning(self, message):
-        """Log warning level message"""
-        self.logger.warning(message)
+        logger.addHandler(QueueHandler(log_queue))
 
-    def debug(self, message):
-        """Log debug level message"""
-        self.logger.debug(message)
+        if invalid_level:
+            logger.warning("Unknown LOG_LEVEL %r, using %s", level, DEFAULT_LOG_LEVEL)
 
-    def critical(self, message):
-        """Log critical level message"""
-        self.logger.critical(message)
+        return logger
 
     def log_order(self, order_type, symbol, side, quantity, params=None):
         """Log order placement with details"""
-        msg = f"ORDER PLACED: {order_type} | {symbol} | {side} | Qty: {quantity}"
         if params:
-            msg += f" | Params: {params}"
-        self.info(msg)
+            self.info("ORDER PLACED: %s | %s | %s | Qty: %s | Params: %s",
+                      order_type, symbol, side, quantity, params)
+        else:
+            self.info("ORDER PLACED: %s | %s | %s | Qty: %s", order_type, symbol, side, quantity)
 
     def log_execution(self, order_id, status, fill_price=None, qty_filled=None):
         """Log order execution details"""
-        msg = f"ORDER EXECUTION: ID={order_id} | Status={status}"
-        if fill_price:
-            msg += f" | Fill Price: {fill_price}"
-        if qty_filled:
-            msg += f" | Qty Filled: {qty_filled}"
-        self.info(msg)
+        fmt = _EXECUTION_FORMATS[bool(fill_price), bool(qty_filled)]
+        extra = tuple(value for value in (fill_price, qty_filled) if value)
+        self.info(fmt, order_id, status, *extra)
 
     def log_validation_error(self, field, value, reason):
         """Log validation errors"""
-        self.error(f"VALIDATION ERROR | Field: {field} | Value: {value} | Reason: {reason}")
+        self.error("VALIDATION ERROR | Field: %s | Value: %s | Reason: %s", field, value, reason)
 
     def log_api_call(self, endpoint, method, data=None):
         """Log API calls"""
-        msg = f"API CALL | Method: {method} | Endpoint: {endpoint}"
         if data:
-            msg += f" | Data: {data}"
-        self.debug(msg)
+            self.debug("API CALL | Method: %s | Endpoint: %s | Data: %s", method, endpoint, data)
+        else:
+            self.debug("API CALL | Method: %s | Endpoint: %s", method, endpoint)
 
     def log_api_response(self, endpoint, status_code, response_data=None):
         """Log API responses"""
-        msg = f"API RESPONSE | Endpoint: {endpoint} | Status: {status_code}"
-        if response_data:
-            msg += f" | Response Keys: {list(response_data.keys()) if isinstance(response_data, dict) else type(response_data)}"
-        self.debug(msg)
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if not response_data:
+            self.debug("API RESPONSE | Endpoint: %s | Status: %s", endpoint, status_code)
+            return
+        # Only reached with DEBUG on, so the key list is built only when it is emitted
+        summary = list(response_data) if isinstance(response_data, dict) else type(response_data)
+        self.debug(
+            "API RESPONSE | Endpoint: %s | Status: %s | Response Keys: %s",
+            endpoint, status_code, summary
+        )
 
 
 # Global logger instance
@@ -4,12 +4,21 @@ Executes market orders at current market price
 """
 
 from typing import Dict, Any
-from datetime import datetime
+from time import time_ns
 from validation import validate_market_order, ValidationError
 from logger import get_logger
 
 logger = get_logger()
 
+# Simulated prices for demo
+SIMULATED_PRICES = {
+    'BTCUSDT': 42500.50,
+    'ETHUSDT': 2350.25,
+    'BNBUSDT': 615.80,
+    'ADAUSDT': 0.98,
+    'DOGEUSDT': 0.38,
+}
+
 
 class MarketOrder:
     """Market order handler - executes immediately at market price"""
@@ -23,6 +32,7 @@ class MarketOrder:
         """
         self.api_client = api_client
         self.order_history = []
+        self._by_order_id = {}
 
     def place_order(
         self,
@@ -51,7 +61,7 @@ class MarketOrder:
         try:
             validated = validate_market_order(symbol, side, quantity)
         except ValidationError as e:
-            logger.error(f"Market order validation failed: {e}")
+            logger.error("Market order validation failed: %s", e)
             raise
 
         symbol = validated['symbol']
@@ -83,16 +93,7 @@ class MarketOrder:
         Returns:
             Simulated order response
         """
-        # Simulated prices for demo
-        simulated_prices = {
-            'BTCUSDT': 42500.50,
-            'ETHUSDT': 2350.25,
-            'BNBUSDT': 615.80,
-            'ADAUSDT': 0.98,
-            'DOGEUSDT': 0.38,
-        }
-
-        current_price = simulated_prices.get(symbol, 100.0)
+        current_price = SIMULATED_PRICES.get(symbol, 100.0)
         fill_amount = quantity * current_price
 
         response = {
@@ -103,7 +104,7 @@ class MarketOrder:
             'quantity': quantity,
             'executedQty': quantity,
             'status': 'FILLED',
-            'updateTime': int(datetime.now().timestamp() * 1000),
+            'updateTime': time_ns() // 1_000_000,
             'fills': [
                 {
                     'price': current_price,
@@ -123,7 +124,7 @@ class MarketOrder:
             quantity
         )
 
-        self.order_history.append(response)
+        self._record(response)
         return response
 
     def _place_via_api(self, symbol: str, side: str, quantity: float) -> Dict[str, Any]:
@@ -141,9 +142,6 @@ class MarketOrder:
         Raises:
             Exception: If API call fails
         """
-        if not self.api_client:
-            raise Exception("API client not configured")
-
         try:
             logger.log_api_call('futures/order', 'POST', {
                 'symbol': symbol,
@@ -168,13 +166,20 @@ class MarketOrder:
                 response.get('executedQty')
             )
 
-            self.order_history.append(response)
+            self._record(response)
             return response
 
         except Exception as e:
-            logger.error(f"API error placing market order: {e}", exc_info=True)
+            logger.error("API error placing market order: %s", e, exc_info=True)
             raise
 
+    def _record(self, response: Dict[str, Any]):
+        """Store an order response in history and index it by order ID"""
+        self.order_history.append(response)
+        order_id = response.get('orderId')
+        if order_id is not None:
+            self._by_order_id[order_id] = response
+
     def get_order_status(self, order_id: int) -> Dict[str, Any]:
         """
         Get status of placed order.
@@ -186,10 +191,10 @@ class MarketOrder:
             Order status dictionary
         """
         # Check history first
-        for order in self.order_history:
-            if order.get('orderId') == order_id:
-                logger.info(f"Order {order_id} found in history: {order['status']}")
-                return order
+        order = self._by_order_id.get(order_id)
+        if order is not None:
+            logger.info("Order %s found in history: %s", order_id, order['status'])
+            return order
 
         # Query via API if not in history
         if self.api_client:
@@ -199,10 +204,10 @@ class MarketOrder:
                 logger.log_api_response('futures/order', 200, response)
                 return response
             except Exception as e:
-                logger.error(f"Error fetching order {order_id}: {e}", exc_info=True)
+                logger.error("Error fetching order %s: %s", order_id, e, exc_info=True)
                 raise
 
-        logger.warning(f"Order {order_id} not found")
+        logger.warning("Order %s not found", order_id)
         return {}
 
     def cancel_order(self, symbol: str, order_id: int) -> Dict[str, Any]:
@@ -217,7 +222,7 @@ class MarketOrder:
             Cancellation response
         """
         if not self.api_client:
-            logger.warning(f"Cannot cancel order {order_id} - no API client")
+            logger.warning("Cannot cancel order %s - no API client", order_id)
             return {'status': 'CANCELLED', 'note': 'Simulated cancellation'}
 
         try:
@@ -232,11 +237,45 @@ class MarketOrder:
             )
 
             logger.log_api_response('futures/order', 200, response)
-            logger.info(f"Order {order_id} cancelled successfully")
+            logger.info("Order %s cancelled successfully", order_id)
             return response
 
         except Exception as e:
-            logger.error(f"Error cancelling order {order_id}: {e}", exc_info=True)
+            logger.error("Error cancelling order %s: %s", order_id, e, exc_info=True)
+            raise
+
+    def cancel_orders(self, symbol: str, order_ids: list) -> list:
+        """
+        Cancel several market orders in one batch request.
+        
+        Args:
+            symbol: Trading pair
+            order_ids: Order IDs to cancel (at most BATCH_CANCEL_MAX)
+            
+        Returns:
+            List of per-order cancellation responses
+        """
+        if not self.api_client:
+            logger.warning("Cannot cancel orders %s - no API client", order_ids)
+            return [{'orderId': order_id, 'status': 'CANCELLED', 'note': 'Simulated cancellation'}
+                    for order_id in order_ids]
+
+        try:
+            responses = self.api_client.futures_batch_cancel_orders(
+                symbol=symbol,
+                orderIdList=order_ids
+            )
+
+            # Batch cancels succeed or fail per order
+            for order_id, response in zip(order_ids, responses):
+                if 'code' in response:
+                    logger.warning("Could not cancel order %s: %s", order_id, response.get('msg'))
+
+            logger.info("Batch cancel sent for %s orders on %s", len(order_ids), symbol)
+            return responses
+
+        except Exception as e:
+            logger.error("Error cancelling orders %s: %s", order_ids, e, exc_info=True)
             raise
 
     def get_order_history(self) -> list:
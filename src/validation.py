@@ -4,6 +4,7 @@ Validates symbols, quantities, prices, and order parameters
 """
 
 import math
+from functools import lru_cache
 from typing import Tuple, Dict, Any, Optional
 from logger import get_logger
 
@@ -19,15 +20,19 @@ class OrderValidator:
     """Centralized validation for order parameters"""
 
     # Common USDT-M trading pairs
-    VALID_SYMBOLS = {
+    VALID_SYMBOLS = frozenset({
         'BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'ADAUSDT', 'DOGEUSDT',
         'XRPUSDT', 'MATICUSDT', 'SOLUSDT', 'LTCUSDT', 'LINKUSDT',
         'AVAXUSDT', 'ATOMUSDT', 'ARBUSDT', 'UNIUSDT', 'APTUSDT',
         'GALAUSDT', 'OPUSDT', 'GMXUSDT', 'RDNTUSDT', 'PEPEUSDT'
-    }
+    })
 
-    VALID_SIDES = {'BUY', 'SELL'}
-    VALID_ORDER_TYPES = {'MARKET', 'LIMIT', 'STOP_LIMIT', 'OCO', 'TWAP', 'GRID'}
+    VALID_SIDES = frozenset({'BUY', 'SELL'})
+    VALID_ORDER_TYPES = frozenset({'MARKET', 'LIMIT', 'STOP_LIMIT', 'OCO', 'TWAP', 'GRID'})
+
+    # Error-message listings, built once
+    _VALID_SYMBOLS_STR = ', '.join(sorted(VALID_SYMBOLS))
+    _VALID_ORDER_TYPES_STR = ', '.join(sorted(VALID_ORDER_TYPES))
 
     # Min/Max constraints
     MIN_QUANTITY = 0.001
@@ -52,15 +57,28 @@ class OrderValidator:
         if not symbol or not isinstance(symbol, str):
             raise ValidationError(f"Symbol must be a non-empty string, got: {symbol}")
 
+        # Already-canonical input needs no normalization
+        if symbol in OrderValidator.VALID_SYMBOLS:
+            # Trace logs are compiled out under python -O
+            if __debug__:
+                logger.debug("Symbol validation passed: %s", symbol)
+            return symbol
+
+        return OrderValidator._validate_symbol_cached(symbol)
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _validate_symbol_cached(symbol: str) -> str:
+        """Normalize and check a symbol string (memoized per distinct input)"""
         symbol = symbol.upper()
 
         if symbol not in OrderValidator.VALID_SYMBOLS:
-            available = ', '.join(sorted(OrderValidator.VALID_SYMBOLS))
             raise ValidationError(
-                f"Symbol '{symbol}' not supported. Available: {available}"
+                f"Symbol '{symbol}' not supported. Available: {OrderValidator._VALID_SYMBOLS_STR}"
             )
 
-        logger.debug(f"Symbol validation passed: {symbol}")
+        if __debug__:
+            logger.debug("Symbol validation passed: %s", symbol)
         return symbol
 
     @staticmethod
@@ -80,12 +98,24 @@ class OrderValidator:
         if not side or not isinstance(side, str):
             raise ValidationError(f"Side must be 'BUY' or 'SELL', got: {side}")
 
+        if side in OrderValidator.VALID_SIDES:
+            if __debug__:
+                logger.debug("Side validation passed: %s", side)
+            return side
+
+        return OrderValidator._validate_side_cached(side)
+
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _validate_side_cached(side: str) -> str:
+        """Normalize and check a side string (memoized per distinct input)"""
         side = side.upper()
 
         if side not in OrderValidator.VALID_SIDES:
             raise ValidationError(f"Side must be 'BUY' or 'SELL', got: {side}")
 
-        logger.debug(f"Side validation passed: {side}")
+        if __debug__:
+            logger.debug("Side validation passed: %s", side)
         return side
 
     @staticmethod
@@ -124,7 +154,8 @@ class OrderValidator:
                 f"Quantity {qty} exceeds maximum {OrderValidator.MAX_QUANTITY}"
             )
 
-        logger.debug(f"Quantity validation passed: {qty} {symbol or ''}")
+        if __debug__:
+            logger.debug("Quantity validation passed: %s %s", qty, symbol or '')
         return qty
 
     @staticmethod
@@ -159,7 +190,8 @@ class OrderValidator:
         if p > OrderValidator.MAX_PRICE:
             raise ValidationError(f"Price {p} exceeds maximum {OrderValidator.MAX_PRICE}")
 
-        logger.debug(f"Price validation passed: {p} {symbol or ''}")
+        if __debug__:
+            logger.debug("Price validation passed: %s %s", p, symbol or '')
         return p
 
     @staticmethod
@@ -203,7 +235,8 @@ class OrderValidator:
                     f"For BUY orders, stop price ({stop}) must be < entry price ({entry})"
                 )
 
-        logger.debug(f"Stop price validation passed: {stop}")
+        if __debug__:
+            logger.debug("Stop price validation passed: %s", stop)
         return stop
 
     @staticmethod
@@ -231,7 +264,8 @@ class OrderValidator:
         if pct <= 0 or pct > 100:
             raise ValidationError(f"Percentage must be between 0 and 100, got: {pct}")
 
-        logger.debug(f"Percentage validation passed: {pct}%")
+        if __debug__:
+            logger.debug("Percentage validation passed: %s%%", pct)
         return pct
 
     @staticmethod
@@ -259,7 +293,8 @@ class OrderValidator:
         if intv < 1:  # Minimum 1 second
             raise ValidationError(f"Interval minimum is 1 second, got: {intv}")
 
-        logger.debug(f"Interval validation passed: {intv}s")
+        if __debug__:
+            logger.debug("Interval validation passed: %ss", intv)
         return intv
 
     @staticmethod
@@ -279,15 +314,17 @@ class OrderValidator:
         if not order_type or not isinstance(order_type, str):
             raise ValidationError(f"Order type must be a string, got: {order_type}")
 
-        order_type = order_type.upper()
+        if order_type not in OrderValidator.VALID_ORDER_TYPES:
+            order_type = order_type.upper()
 
         if order_type not in OrderValidator.VALID_ORDER_TYPES:
-            valid_types = ', '.join(OrderValidator.VALID_ORDER_TYPES)
             raise ValidationError(
-                f"Order type '{order_type}' not supported. Valid: {valid_types}"
+                f"Order type '{order_type}' not supported. "
+                f"Valid: {OrderValidator._VALID_ORDER_TYPES_STR}"
             )
 
-        logger.debug(f"Order type validation passed: {order_type}")
+        if __debug__:
+            logger.debug("Order type validation passed: %s", order_type)
         return order_type
 
 